@@ -0,0 +1,209 @@
+"""
+Shared helpers for the Prompt Paladin hook scripts.
+
+Terminal output, ~/.cursor/hooks.json loading (cached per file stat) and
+durable-write helpers used by hooks/install.py and hooks/uninstall.py, plus
+the JSON codec also used by the hook and its worker. All of them import
+this as a sibling module (hooks/ is not a package).
+"""
+
+import json
+import os
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# orjson parses/serializes in C and writes bytes directly; its
+# JSONDecodeError subclasses json.JSONDecodeError
+try:
+    import orjson
+    
+    json_loads = orjson.loads
+    json_bytes = orjson.dumps
+    
+    def json_dumps(obj, pretty: bool = True) -> bytes:
+        """Serialize to bytes with a trailing newline (2-space indent if pretty)."""
+        option = orjson.OPT_APPEND_NEWLINE
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+except ImportError:
+    json_loads = json.loads
+    
+    def json_bytes(obj) -> bytes:
+        """Serialize to compact UTF-8 bytes (no trailing newline)."""
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    
+    def json_dumps(obj, pretty: bool = True) -> bytes:
+        """Serialize to bytes with a trailing newline (2-space indent if pretty)."""
+        if pretty:
+            text = json.dumps(obj, indent=2)
+        else:
+            text = json.dumps(obj, separators=(',', ':'))
+        return (text + '\n').encode('utf-8')
+
+
+# Colors for terminal output
+class Colors:
+    GREEN = '\033[92m'
+    YELLOW = '\033[93m'
+    RED = '\033[91m'
+    BLUE = '\033[94m'
+    BOLD = '\033[1m'
+    END = '\033[0m'
+
+
+def print_success(msg: str):
+    print(f"{Colors.GREEN}✓{Colors.END} {msg}")
+
+
+def print_info(msg: str):
+    print(f"{Colors.BLUE}ℹ{Colors.END} {msg}")
+
+
+def print_warning(msg: str):
+    print(f"{Colors.YELLOW}⚠{Colors.END} {msg}")
+
+
+def print_error(msg: str):
+    print(f"{Colors.RED}✗{Colors.END} {msg}")
+
+
+def get_project_root() -> Path:
+    """Get the absolute path to the project root."""
+    # This module is in hooks/, so project root is parent
+    return Path(__file__).parent.parent.resolve()
+
+
+def get_hooks_config_path() -> Path:
+    """Get the path to ~/.cursor/hooks.json."""
+    return Path.home() / ".cursor" / "hooks.json"
+
+
+@lru_cache(maxsize=8)
+def _load_hooks_json(path: str, mtime_ns: int, size: int) -> Dict:
+    """Parse hooks.json; cached per (path, mtime, size) so unchanged files aren't re-read."""
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+
+def load_hooks_config() -> Optional[Dict]:
+    """
+    Load existing hooks configuration.
+    
+    The parsed dict is cached and shared between calls while the file is
+    unchanged, so copy any part of it before modifying it.
+    
+    Returns:
+        Dict if file exists and is valid JSON, None otherwise
+    """
+    config_path = get_hooks_config_path()
+    
+    try:
+        st = config_path.stat()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print_error(f"Error reading hooks.json: {e}")
+        return None
+    
+    try:
+        return _load_hooks_json(str(config_path), st.st_mtime_ns, st.st_size)
+    except json.JSONDecodeError as e:
+        print_error(f"Existing hooks.json is corrupted: {e}")
+        print_info(f"Location: {config_path}")
+        return None
+    except Exception as e:
+        print_error(f"Error reading hooks.json: {e}")
+        return None
+
+
+def create_backup(config_path: Path) -> Optional[Path]:
+    """
+    Create a timestamped backup of the hooks config.
+    
+    Returns:
+        Path to backup file, or None if backup failed
+    """
+    if not config_path.exists():
+        return None
+    
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    backup_path = config_path.with_suffix(f".backup.{timestamp}")
+    
+    try:
+        # hooks.json is only ever replaced by rename (see write_json), so a
+        # hard link is a stable snapshot and costs no data copy
+        try:
+            os.link(config_path, backup_path)
+        except OSError:
+            # Cross-device, unsupported filesystem or existing backup name
+            # shutil is imported here, not at module level, so the prompt
+            # hook (which imports this module for JSON) doesn't pay for it
+            import shutil
+            
+            shutil.copyfile(config_path, backup_path)
+        return backup_path
+    except Exception as e:
+        print_warning(f"Could not create backup: {e}")
+        return None
+
+
+def fsync_dir(directory: Path):
+    """Flush a directory entry (e.g. after rename) to disk; no-op where unsupported."""
+    try:
+        dir_fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return  # e.g. Windows can't open directories
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def hook_matches(hook: Dict, project_str: str) -> bool:
+    """
+    Check if a hook configuration is for Prompt Paladin.
+    
+    Matches by checking if command or args contain the project path
+    (passed pre-stringified so callers convert it once per loop).
+    """
+    command = hook.get('command', '')
+    if isinstance(command, str) and project_str in command:
+        return True
+    return any(
+        isinstance(arg, str) and project_str in arg
+        for arg in hook.get('args', ())
+    )
+
+
+def write_json(path: Path, obj, *, pretty: bool = True):
+    """
+    Durably replace `path` with `obj` serialized as JSON.
+    
+    Writes a temp file, fsyncs it, renames it over `path` and fsyncs the
+    directory, so a crash leaves either the old or the new contents.
+    
+    Raises:
+        OSError/TypeError: If serialization or the write fails (the temp
+        file is removed first)
+    """
+    data = json_dumps(obj, pretty=pretty)
+    temp_path = path.with_suffix('.tmp')
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        temp_path.replace(path)
+    except BaseException:
+        try:
+            temp_path.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+    fsync_dir(path.parent)
@@ -9,134 +9,55 @@ Usage:
     python hooks/install.py              # Install hook
     python hooks/install.py --dry-run    # Preview changes
     python hooks/install.py --force      # Reinstall even if present
+    python hooks/install.py --no-backup  # Skip hooks.json backup
 """
 
-import json
-import os
 import sys
 import argparse
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-
-
-# Colors for terminal output
-class Colors:
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    RED = '\033[91m'
-    BLUE = '\033[94m'
-    BOLD = '\033[1m'
-    END = '\033[0m'
-
-
-def print_success(msg: str):
-    print(f"{Colors.GREEN}✓{Colors.END} {msg}")
-
-
-def print_info(msg: str):
-    print(f"{Colors.BLUE}ℹ{Colors.END} {msg}")
-
-
-def print_warning(msg: str):
-    print(f"{Colors.YELLOW}⚠{Colors.END} {msg}")
-
-
-def print_error(msg: str):
-    print(f"{Colors.RED}✗{Colors.END} {msg}")
-
-
-def get_project_root() -> Path:
-    """Get the absolute path to the project root."""
-    # This script is in hooks/, so project root is parent
-    return Path(__file__).parent.parent.resolve()
-
-
-def get_hooks_config_path() -> Path:
-    """Get the path to ~/.cursor/hooks.json."""
-    return Path.home() / ".cursor" / "hooks.json"
-
-
-def load_hooks_config() -> Optional[Dict]:
-    """
-    Load existing hooks configuration.
-    
-    Returns:
-        Dict if file exists and is valid JSON, None otherwise
-    """
-    config_path = get_hooks_config_path()
-    
-    if not config_path.exists():
-        return None
-    
-    try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
-        print_error(f"Existing hooks.json is corrupted: {e}")
-        print_info(f"Location: {config_path}")
-        return None
-    except Exception as e:
-        print_error(f"Error reading hooks.json: {e}")
-        return None
-
-
-def create_backup(config_path: Path) -> Optional[Path]:
-    """
-    Create a timestamped backup of the hooks config.
-    
-    Returns:
-        Path to backup file, or None if backup failed
-    """
-    if not config_path.exists():
-        return None
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = config_path.with_suffix(f".backup.{timestamp}")
-    
-    try:
-        import shutil
-        shutil.copy2(config_path, backup_path)
-        return backup_path
-    except Exception as e:
-        print_warning(f"Could not create backup: {e}")
-        return None
-
-
-def is_prompt_paladin_hook(hook: Dict, project_root: Path) -> bool:
-    """
-    Check if a hook configuration is for Prompt Paladin.
-    
-    Matches by checking if command or args contain the project path.
-    """
-    project_str = str(project_root)
-    
-    command = hook.get('command', '')
-    args = hook.get('args', [])
-    
-    # Check if command contains project path
-    if project_str in str(command):
-        return True
-    
-    # Check if any arg contains project path
-    for arg in args:
-        if project_str in str(arg):
-            return True
-    
-    return False
+from typing import Dict, Optional, Tuple
+
+from _common import (
+    create_backup,
+    get_hooks_config_path,
+    get_project_root,
+    hook_matches,
+    json_dumps,
+    load_hooks_config,
+    print_error,
+    print_info,
+    print_success,
+    print_warning,
+    write_json,
+)
 
 
 def find_prompt_paladin_hook(config: Dict, project_root: Path) -> Tuple[Optional[int], Optional[Dict]]:
     """
     Find Prompt Paladin hook in the config.
     
+    Looks up the current wrapper command directly, then falls back to a
+    substring scan for hooks pointing at an older path of this project.
+    
     Returns:
         (index, hook_dict) if found, (None, None) otherwise
     """
     hooks_list = config.get('hooks', {}).get('beforeSubmitPrompt', [])
     
+    # First index per command (duplicates keep the earliest, like the scan)
+    idx_by_cmd = {}
+    for idx, hook in enumerate(hooks_list):
+        command = hook.get('command', '')
+        if isinstance(command, str):
+            idx_by_cmd.setdefault(command, idx)
+    
+    idx = idx_by_cmd.get(create_hook_config(project_root)['command'])
+    if idx is not None:
+        return idx, hooks_list[idx]
+    
+    project_str = str(project_root)
     for idx, hook in enumerate(hooks_list):
-        if is_prompt_paladin_hook(hook, project_root):
+        if hook_matches(hook, project_str):
             return idx, hook
     
     return None, None
@@ -153,13 +74,7 @@ def create_hook_config(project_root: Path) -> Dict:
     }
 
 
-def hooks_are_equal(hook1: Dict, hook2: Dict) -> bool:
-    """Check if two hook configs are functionally equivalent."""
-    # With wrapper approach, only command matters
-    return hook1.get('command') == hook2.get('command')
-
-
-def install_hook(dry_run: bool = False, force: bool = False) -> int:
+def install_hook(dry_run: bool = False, force: bool = False, backup: bool = True) -> int:
     """
     Install the Prompt Paladin hook.
     
@@ -200,12 +115,12 @@ def install_hook(dry_run: bool = False, force: bool = False) -> int:
         }
         print_info("No existing hooks.json found, will create new")
     else:
-        config = existing_config
-        # Ensure structure exists
-        if 'hooks' not in config:
-            config['hooks'] = {}
-        if 'beforeSubmitPrompt' not in config['hooks']:
-            config['hooks']['beforeSubmitPrompt'] = []
+        # Shallow-copy the parts we modify; the loaded dict is cached
+        config = dict(existing_config)
+        config['hooks'] = dict(config.get('hooks', {}))
+        config['hooks']['beforeSubmitPrompt'] = list(
+            config['hooks'].get('beforeSubmitPrompt', [])
+        )
     
     # Check if already installed
     idx, existing_hook = find_prompt_paladin_hook(config, project_root)
@@ -213,7 +128,8 @@ def install_hook(dry_run: bool = False, force: bool = False) -> int:
     
     if idx is not None:
         # Already installed
-        if hooks_are_equal(existing_hook, new_hook):
+        # With the wrapper approach, only the command matters
+        if existing_hook.get('command') == new_hook['command']:
             if not force:
                 print_success("Prompt Paladin hook is already installed")
                 print_info("Use --force to reinstall")
@@ -238,11 +154,12 @@ def install_hook(dry_run: bool = False, force: bool = False) -> int:
         print_info("DRY RUN - No changes will be made")
         print()
         print("Would write to ~/.cursor/hooks.json:")
-        print(json.dumps(config, indent=2))
+        print(json_dumps(config).decode('utf-8'), end='')
         return 0
     
-    # Create backup if file exists
-    if config_path.exists():
+    # Create backup if file exists (the write below is fsync'd, so the
+    # backup is a convenience rather than crash protection)
+    if backup and config_path.exists():
         backup_path = create_backup(config_path)
         if backup_path:
             print_info(f"Backup created: {backup_path.name}")
@@ -250,15 +167,9 @@ def install_hook(dry_run: bool = False, force: bool = False) -> int:
     # Ensure ~/.cursor directory exists
     config_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Write config atomically (temp file + rename)
-    temp_path = config_path.with_suffix('.tmp')
+    # Write config atomically (temp file + fsync + rename)
     try:
-        with open(temp_path, 'w') as f:
-            json.dump(config, f, indent=2)
-            f.write('\n')  # Add trailing newline
-        
-        # Atomic rename
-        temp_path.replace(config_path)
+        write_json(config_path, config)
         
         print()
         if action == "install":
@@ -279,8 +190,6 @@ def install_hook(dry_run: bool = False, force: bool = False) -> int:
         
     except Exception as e:
         print_error(f"Failed to write config: {e}")
-        if temp_path.exists():
-            temp_path.unlink()
         return 1
 
 
@@ -293,8 +202,14 @@ Examples:
   python hooks/install.py              # Install hook
   python hooks/install.py --dry-run    # Preview changes
   python hooks/install.py --force      # Reinstall even if present
+  python hooks/install.py --no-backup  # Skip hooks.json backup
         """
     )
+    parser.add_argument(
+        '--no-backup',
+        action='store_true',
+        help='Skip the timestamped hooks.json backup'
+    )
     parser.add_argument(
         '--dry-run',
         action='store_true',
@@ -309,7 +224,7 @@ Examples:
     args = parser.parse_args()
     
     try:
-        sys.exit(install_hook(dry_run=args.dry_run, force=args.force))
+        sys.exit(install_hook(dry_run=args.dry_run, force=args.force, backup=not args.no_backup))
     except KeyboardInterrupt:
         print()
         print_warning("Cancelled by user")
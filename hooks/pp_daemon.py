@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Persistent worker for the Prompt Paladin Cursor hook.
+
+Imports the MCP tools (and their LLM clients) once, then serves pp-guard /
+pp-heal requests over a Unix domain socket so each hook invocation only
+pays a socket round-trip instead of a cold import.
+
+One worker runs per identical configuration: the socket path is derived
+from a hash of the relevant environment and the worker command line. The
+socket and its lock live in a per-user 0700 directory ($XDG_RUNTIME_DIR or
+/tmp/pp-paladin-<uid>) and both ends check the peer's uid.
+The worker exits on its own after being idle for HOOK_DAEMON_IDLE_SECS.
+
+Resubmitting the same prompt is answered from the tools' exact-match
+response cache (RESPONSE_CACHE / RESPONSE_CACHE_TTL_SECS); the worker writes
+that cache to hooks/.response_cache.json when it exits and reloads it on
+startup.
+
+Protocol: each message is a 4-byte big-endian length followed by UTF-8
+JSON. Requests look like {"op": "guard"|"heal"|"ping", "prompt": "...",
+"mode": "..."}; responses are {"result": {...}} or {"error": "..."}.
+
+Usage:
+    python hooks/pp_daemon.py    # Normally spawned by before_submit_prompt.py
+"""
+import errno
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional
+
+from _common import json_bytes, json_loads
+
+DAEMON_SCRIPT = Path(__file__).resolve()
+PROJECT_ROOT = DAEMON_SCRIPT.parent.parent
+LOG_FILE = DAEMON_SCRIPT.parent / "daemon.log"
+LOG_MAX_BYTES = 1024*1024  # 1MB
+RESPONSE_CACHE_FILE = DAEMON_SCRIPT.parent / ".response_cache.json"
+
+# Environment variables that change tool behaviour; a different value means
+# a different worker (mirrors the hook/MCP config surface).
+CONFIG_ENV_PREFIXES = (
+    "ANTHROPIC_",
+    "OPENAI_",
+    "GROQ_",
+    "DEFAULT_",
+    "PP_",
+    "AUTO_CAST_HEAL",
+    "ANGER_TRANSLATOR",
+    "SEMANTIC_CACHE",
+    "RESPONSE_CACHE",
+    "FAST_PATH",
+    "PRECONNECT",
+    "HEAL_SKIP_",
+    "LOG_LEVEL",
+    "HOOK_DAEMON_",
+)
+
+_HEADER = struct.Struct(">I")
+
+logger = logging.getLogger("prompt_paladin_daemon")
+
+
+# ============================================
+# Wire Protocol
+# ============================================
+
+def send_message(sock: socket.socket, payload: Dict) -> None:
+    """Send one length-prefixed JSON message."""
+    data = json_bytes(payload)
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """Read exactly `size` bytes or raise ConnectionError on EOF."""
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("Connection closed mid-message")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Dict:
+    """Receive one length-prefixed JSON message."""
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json_loads(_recv_exact(sock, size))
+
+
+# ============================================
+# Socket Location
+# ============================================
+
+def daemon_args() -> List[str]:
+    """Command line used to launch the worker."""
+    return [sys.executable, str(DAEMON_SCRIPT)]
+
+
+def compute_config_hash(env: Mapping[str, str], args: List[str]) -> str:
+    """
+    Hash the worker configuration so identical configs share one worker.
+
+    Args:
+        env: Environment mapping (only config-relevant keys are used)
+        args: Worker command line
+
+    Returns:
+        Short hex digest
+    """
+    relevant = sorted(
+        (key, value) for key, value in env.items()
+        if key.startswith(CONFIG_ENV_PREFIXES)
+    )
+    payload = json.dumps(
+        {"env": relevant, "args": args, "uid": os.getuid()},
+        separators=(",", ":"),
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def get_runtime_dir(env: Optional[Mapping[str, str]] = None) -> Path:
+    """
+    Get (creating it if needed) the private directory for worker sockets.
+
+    Uses $XDG_RUNTIME_DIR/prompt-paladin when set, else /tmp/pp-paladin-<uid>.
+    A fixed name under /tmp can be pre-created by another user, so the
+    directory is only trusted if it is a real directory owned by us with no
+    group/other permissions.
+
+    Raises:
+        PermissionError: The directory exists but fails those checks
+    """
+    env = os.environ if env is None else env
+    runtime_root = env.get("XDG_RUNTIME_DIR")
+    if runtime_root:
+        runtime_dir = Path(runtime_root) / "prompt-paladin"
+    else:
+        runtime_dir = Path("/tmp") / f"pp-paladin-{os.getuid()}"
+
+    try:
+        os.mkdir(runtime_dir, 0o700)
+    except FileExistsError:
+        pass
+
+    st = os.lstat(runtime_dir)
+    if (
+        not stat.S_ISDIR(st.st_mode)
+        or st.st_uid != os.getuid()
+        or st.st_mode & 0o077
+    ):
+        raise PermissionError(f"Refusing insecure worker directory {runtime_dir}")
+    return runtime_dir
+
+
+def get_socket_path(env: Optional[Mapping[str, str]] = None) -> Path:
+    """Get the socket path for the worker matching `env` (default: os.environ)."""
+    env = os.environ if env is None else env
+    config_hash = compute_config_hash(env, daemon_args())
+    return get_runtime_dir(env) / f"{config_hash}.sock"
+
+
+def peer_uid(sock: socket.socket) -> int:
+    """
+    Get the uid of the process on the other end of a connected Unix socket.
+
+    Raises:
+        OSError: The platform offers no peer credentials
+    """
+    if hasattr(socket, "SO_PEERCRED"):
+        # Linux: struct ucred {pid_t pid; uid_t uid; gid_t gid;}
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        return struct.unpack("3i", creds)[1]
+    if hasattr(socket, "LOCAL_PEERCRED"):
+        # macOS/BSD: struct xucred starts with {u_int version; uid_t uid;}
+        creds = sock.getsockopt(0, socket.LOCAL_PEERCRED, 76)  # SOL_LOCAL, sizeof(xucred)
+        return struct.unpack_from("=II", creds)[1]
+    raise OSError(errno.ENOTSUP, "Peer credentials not supported on this platform")
+
+
+# ============================================
+# Client Side (used by the hook)
+# ============================================
+
+def request(socket_path: Path, payload: Dict, timeout: float) -> Dict:
+    """
+    Send one request to a running worker and wait for the response.
+
+    Returns:
+        The tool's result dict
+
+    Raises:
+        ConnectionRefusedError / FileNotFoundError: No worker listening
+        PermissionError: The listening process belongs to another user
+        socket.timeout: Worker did not answer in time
+        RuntimeError: Worker reported an error
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        if peer_uid(sock) != os.getuid():
+            raise PermissionError(f"Worker on {socket_path} is owned by another user")
+        send_message(sock, payload)
+        response = recv_message(sock)
+
+    if "error" in response:
+        raise RuntimeError(f"Worker error: {response['error']}")
+    return response["result"]
+
+
+def spawn(env: Optional[Mapping[str, str]] = None) -> int:
+    """
+    Launch a detached worker process.
+
+    The worker gets its own session and /dev/null stdio so it never holds
+    the hook's stdout pipe open.
+
+    Returns:
+        PID of the spawned worker
+    """
+    file_actions = [
+        (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+        (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+        (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+    ]
+    args = daemon_args()
+    return os.posix_spawn(
+        args[0],
+        args,
+        dict(os.environ if env is None else env),
+        file_actions=file_actions,
+        setsid=True,
+    )
+
+
+# ============================================
+# Server Side
+# ============================================
+
+class PaladinDaemon(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server that tracks when it was last used."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, tools: Dict):
+        self.tools = tools
+        self.last_used = time.monotonic()
+        super().__init__(str(socket_path), PaladinRequestHandler)
+
+
+class PaladinRequestHandler(socketserver.BaseRequestHandler):
+    """Handles one length-prefixed JSON request per connection."""
+
+    def handle(self):
+        self.server.last_used = time.monotonic()
+        try:
+            uid = peer_uid(self.request)
+        except OSError as e:
+            logger.warning(f"Dropping connection, peer credentials unavailable: {e}")
+            return
+        if uid != os.getuid():
+            logger.warning(f"Dropping connection from uid {uid}")
+            return
+
+        try:
+            payload = recv_message(self.request)
+            response = {"result": dispatch(payload, self.server.tools)}
+        except Exception as e:
+            logger.error(f"Request failed: {e}", exc_info=True)
+            response = {"error": str(e)}
+
+        try:
+            send_message(self.request, response)
+        except OSError as e:
+            # Client gave up (timeout) - nothing to report back to
+            logger.warning(f"Could not send response: {e}")
+        self.server.last_used = time.monotonic()
+
+
+def dispatch(payload: Dict, tools: Dict) -> Dict:
+    """
+    Route a request to the matching MCP tool.
+
+    Args:
+        payload: Request dict with op, prompt and optional mode
+        tools: Mapping of tool names to callables
+
+    Returns:
+        Tool result dict
+    """
+    op = payload.get("op")
+    prompt = payload.get("prompt", "")
+
+    if op == "guard":
+        return tools["pp_guard"](prompt=prompt)
+    if op == "heal":
+        return tools["pp_heal"](prompt=prompt, mode=payload.get("mode", "auto"))
+    if op == "ping":
+        return {"ok": True, "pid": os.getpid()}
+
+    raise ValueError(f"Unknown op: {op}")
+
+
+def _setup_logging():
+    """Send daemon and MCP tool logs to hooks/daemon.log."""
+    from logging.handlers import RotatingFileHandler
+
+    class _StartupRotatingFileHandler(RotatingFileHandler):
+        """Rotates only at worker start; skips the per-record tell()."""
+
+        def shouldRollover(self, record):
+            return False
+
+    root = logging.getLogger()
+    # Idempotent: never attach a second file handler (double-logged lines)
+    if any(getattr(h, "baseFilename", None) == str(LOG_FILE) for h in root.handlers):
+        return
+
+    handler = _StartupRotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=3)
+    # The worker exits after HOOK_DAEMON_IDLE_SECS, so one size check per
+    # start keeps daemon.log bounded without stat-ing on every emit
+    try:
+        if os.stat(LOG_FILE).st_size > LOG_MAX_BYTES:
+            handler.doRollover()
+    except OSError:
+        pass
+    handler.setFormatter(logging.Formatter(
+        '%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+
+def _is_listening(socket_path: Path) -> bool:
+    """Check whether another worker already owns the socket."""
+    try:
+        request(socket_path, {"op": "ping"}, timeout=0.5)
+        return True
+    except Exception:
+        return False
+
+
+@contextmanager
+def _socket_lock(socket_path: Path, blocking: bool = True) -> Iterator[bool]:
+    """
+    Hold an exclusive flock on `<socket>.lock` while touching the socket path.
+
+    Yields:
+        True if the lock was acquired, False if `blocking` is off and another
+        worker holds it
+    """
+    fd = os.open(
+        f"{socket_path}.lock",
+        os.O_WRONLY | os.O_CREAT | os.O_NOFOLLOW | os.O_CLOEXEC,
+        0o600,
+    )
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+    finally:
+        os.close(fd)  # Closing the descriptor releases the flock
+
+
+def serve(idle_ttl: float) -> int:
+    """
+    Bind the worker socket and serve until idle for `idle_ttl` seconds.
+
+    Concurrent hooks may spawn several workers for the same config; the
+    socket lock makes the check/unlink/bind sequence atomic so exactly one
+    of them binds and the rest exit 0.
+
+    Returns:
+        Process exit code
+    """
+    socket_path = get_socket_path()
+
+    with _socket_lock(socket_path, blocking=False) as acquired:
+        if not acquired:
+            logger.info(f"Another worker is starting on {socket_path}, exiting")
+            return 0
+
+        if _is_listening(socket_path):
+            logger.info(f"Worker already running on {socket_path}, exiting")
+            return 0
+
+        if str(PROJECT_ROOT) not in sys.path:
+            sys.path.insert(0, str(PROJECT_ROOT))
+        from mcp_server.tools import (
+            load_response_cache,
+            log_system_prompt_fingerprints,
+            pp_guard,
+            pp_heal,
+            preconnect_providers,
+            save_response_cache,
+        )
+
+        log_system_prompt_fingerprints()
+        preconnect_providers()
+        # Cache keys cover tool, model, system prompt and request, so entries
+        # saved under another configuration simply never match
+        load_response_cache(RESPONSE_CACHE_FILE)
+
+        # Remove stale socket left by a crashed worker (safe: we hold the lock
+        # and nothing answered the ping)
+        try:
+            socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+        try:
+            server = PaladinDaemon(socket_path, {"pp_guard": pp_guard, "pp_heal": pp_heal})
+        except OSError as e:
+            if e.errno != errno.EADDRINUSE:
+                raise
+            logger.info(f"Another worker won the bind on {socket_path}, exiting")
+            return 0
+        # The 0700 runtime directory already keeps other users out between
+        # bind and chmod; the socket mode is belt and braces
+        os.chmod(socket_path, 0o600)
+        socket_inode = os.stat(socket_path).st_ino
+
+    server.timeout = min(5.0, idle_ttl)
+    logger.info(f"Worker {os.getpid()} listening on {socket_path} (idle TTL {idle_ttl}s)")
+
+    try:
+        while time.monotonic() - server.last_used < idle_ttl:
+            server.handle_request()
+    finally:
+        with _socket_lock(socket_path):
+            server.server_close()
+            # Only remove the socket we bound; a newer worker may already
+            # have replaced it
+            try:
+                if os.stat(socket_path).st_ino == socket_inode:
+                    socket_path.unlink()
+            except FileNotFoundError:
+                pass
+        save_response_cache(RESPONSE_CACHE_FILE)
+        logger.info(f"Worker {os.getpid()} exiting after idle timeout")
+
+    return 0
+
+
+def main():
+    _setup_logging()
+    idle_ttl = float(os.getenv("HOOK_DAEMON_IDLE_SECS", "600"))
+    try:
+        sys.exit(serve(idle_ttl))
+    except Exception as e:
+        logger.error(f"Worker crashed: {e}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,120 +9,26 @@ Usage:
     python hooks/uninstall.py              # Uninstall hook
     python hooks/uninstall.py --dry-run    # Preview changes
     python hooks/uninstall.py --keep-empty # Keep file even if empty
+    python hooks/uninstall.py --no-backup  # Skip hooks.json backup
 """
 
-import json
-import os
 import sys
 import argparse
-from pathlib import Path
-from datetime import datetime
-from typing import Dict, Optional
-
-
-# Colors for terminal output
-class Colors:
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    RED = '\033[91m'
-    BLUE = '\033[94m'
-    BOLD = '\033[1m'
-    END = '\033[0m'
-
-
-def print_success(msg: str):
-    print(f"{Colors.GREEN}✓{Colors.END} {msg}")
-
-
-def print_info(msg: str):
-    print(f"{Colors.BLUE}ℹ{Colors.END} {msg}")
-
-
-def print_warning(msg: str):
-    print(f"{Colors.YELLOW}⚠{Colors.END} {msg}")
-
-
-def print_error(msg: str):
-    print(f"{Colors.RED}✗{Colors.END} {msg}")
-
-
-def get_project_root() -> Path:
-    """Get the absolute path to the project root."""
-    return Path(__file__).parent.parent.resolve()
-
-
-def get_hooks_config_path() -> Path:
-    """Get the path to ~/.cursor/hooks.json."""
-    return Path.home() / ".cursor" / "hooks.json"
-
-
-def load_hooks_config() -> Optional[Dict]:
-    """
-    Load existing hooks configuration.
-    
-    Returns:
-        Dict if file exists and is valid JSON, None otherwise
-    """
-    config_path = get_hooks_config_path()
-    
-    if not config_path.exists():
-        return None
-    
-    try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
-        print_error(f"Existing hooks.json is corrupted: {e}")
-        print_info(f"Location: {config_path}")
-        return None
-    except Exception as e:
-        print_error(f"Error reading hooks.json: {e}")
-        return None
-
-
-def create_backup(config_path: Path) -> Optional[Path]:
-    """
-    Create a timestamped backup of the hooks config.
-    
-    Returns:
-        Path to backup file, or None if backup failed
-    """
-    if not config_path.exists():
-        return None
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = config_path.with_suffix(f".backup.{timestamp}")
-    
-    try:
-        import shutil
-        shutil.copy2(config_path, backup_path)
-        return backup_path
-    except Exception as e:
-        print_warning(f"Could not create backup: {e}")
-        return None
-
-
-def is_prompt_paladin_hook(hook: Dict, project_root: Path) -> bool:
-    """
-    Check if a hook configuration is for Prompt Paladin.
-    
-    Matches by checking if command or args contain the project path.
-    """
-    project_str = str(project_root)
-    
-    command = hook.get('command', '')
-    args = hook.get('args', [])
-    
-    # Check if command contains project path
-    if project_str in str(command):
-        return True
-    
-    # Check if any arg contains project path
-    for arg in args:
-        if project_str in str(arg):
-            return True
-    
-    return False
+from typing import Dict
+
+from _common import (
+    create_backup,
+    fsync_dir,
+    get_hooks_config_path,
+    get_project_root,
+    hook_matches,
+    load_hooks_config,
+    print_error,
+    print_info,
+    print_success,
+    print_warning,
+    write_json,
+)
 
 
 def has_other_hooks(config: Dict) -> bool:
@@ -137,7 +43,7 @@ def has_other_hooks(config: Dict) -> bool:
     return False
 
 
-def uninstall_hook(dry_run: bool = False, keep_empty: bool = False) -> int:
+def uninstall_hook(dry_run: bool = False, keep_empty: bool = False, backup: bool = True) -> int:
     """
     Uninstall the Prompt Paladin hook.
     
@@ -162,13 +68,18 @@ def uninstall_hook(dry_run: bool = False, keep_empty: bool = False) -> int:
         print_error("Could not load hooks.json")
         return 1
     
+    # Shallow-copy the parts we modify; the loaded dict is cached
+    config = dict(config)
+    config['hooks'] = dict(config.get('hooks', {}))
+    
     # Find Prompt Paladin hook
     before_submit_hooks = config.get('hooks', {}).get('beforeSubmitPrompt', [])
     
     # Find all non-Prompt-Paladin hooks
+    project_str = str(project_root)
     other_hooks = [
         hook for hook in before_submit_hooks
-        if not is_prompt_paladin_hook(hook, project_root)
+        if not hook_matches(hook, project_str)
     ]
     
     # Check if hook was found
@@ -196,10 +107,11 @@ def uninstall_hook(dry_run: bool = False, keep_empty: bool = False) -> int:
                 print("Would delete hooks.json (no remaining hooks)")
         return 0
     
-    # Create backup
-    backup_path = create_backup(config_path)
-    if backup_path:
-        print_info(f"Backup created: {backup_path.name}")
+    # Create backup (writes below are fsync'd, so this is optional)
+    if backup:
+        backup_path = create_backup(config_path)
+        if backup_path:
+            print_info(f"Backup created: {backup_path.name}")
     
     # Update config
     if other_hooks:
@@ -207,12 +119,7 @@ def uninstall_hook(dry_run: bool = False, keep_empty: bool = False) -> int:
         config['hooks']['beforeSubmitPrompt'] = other_hooks
         
         try:
-            temp_path = config_path.with_suffix('.tmp')
-            with open(temp_path, 'w') as f:
-                json.dump(config, f, indent=2)
-                f.write('\n')
-            
-            temp_path.replace(config_path)
+            write_json(config_path, config)
             
             print()
             print_success("Hook uninstalled successfully!")
@@ -220,8 +127,6 @@ def uninstall_hook(dry_run: bool = False, keep_empty: bool = False) -> int:
             
         except Exception as e:
             print_error(f"Failed to write config: {e}")
-            if temp_path.exists():
-                temp_path.unlink()
             return 1
     
     elif has_other_hooks(config) or keep_empty:
@@ -234,12 +139,7 @@ def uninstall_hook(dry_run: bool = False, keep_empty: bool = False) -> int:
                 del config['hooks']['beforeSubmitPrompt']
         
         try:
-            temp_path = config_path.with_suffix('.tmp')
-            with open(temp_path, 'w') as f:
-                json.dump(config, f, indent=2)
-                f.write('\n')
-            
-            temp_path.replace(config_path)
+            write_json(config_path, config)
             
             print()
             print_success("Hook uninstalled successfully!")
@@ -247,14 +147,13 @@ def uninstall_hook(dry_run: bool = False, keep_empty: bool = False) -> int:
             
         except Exception as e:
             print_error(f"Failed to write config: {e}")
-            if temp_path.exists():
-                temp_path.unlink()
             return 1
     
     else:
         # Delete file (no remaining hooks)
         try:
             config_path.unlink()
+            fsync_dir(config_path.parent)
             print()
             print_success("Hook uninstalled successfully!")
             print_info("Deleted hooks.json (no remaining hooks)")
@@ -281,8 +180,14 @@ Examples:
   python hooks/uninstall.py              # Uninstall hook
   python hooks/uninstall.py --dry-run    # Preview changes
   python hooks/uninstall.py --keep-empty # Keep file even if empty
+  python hooks/uninstall.py --no-backup  # Skip hooks.json backup
         """
     )
+    parser.add_argument(
+        '--no-backup',
+        action='store_true',
+        help='Skip the timestamped hooks.json backup'
+    )
     parser.add_argument(
         '--dry-run',
         action='store_true',
@@ -297,7 +202,7 @@ Examples:
     args = parser.parse_args()
     
     try:
-        sys.exit(uninstall_hook(dry_run=args.dry_run, keep_empty=args.keep_empty))
+        sys.exit(uninstall_hook(dry_run=args.dry_run, keep_empty=args.keep_empty, backup=not args.no_backup))
     except KeyboardInterrupt:
         print()
         print_warning("Cancelled by user")
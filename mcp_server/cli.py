@@ -1,4 +1,6 @@
 """CLI entrypoint for Prompt Paladin MCP server."""
+import signal
+
 import typer
 
 app = typer.Typer(
@@ -11,7 +13,8 @@ app = typer.Typer(
 def serve():
     """Start the MCP server (stdio mode)."""
     from .server import mcp
-    from .config import load_config
+    from .config import load_config, reload_config
+    from .tools import clear_response_cache, log_system_prompt_fingerprints, preconnect_providers
     
     typer.echo("🏰 Starting Prompt Paladin MCP Server...", err=True)
     
@@ -23,6 +26,17 @@ def serve():
         typer.echo(f"   Auto-cast Heal: {config.auto_cast_heal}", err=True)
         typer.echo(f"   Anger Translator: {config.anger_translator}", err=True)
         typer.echo("", err=True)
+        log_system_prompt_fingerprints()
+        preconnect_providers()
+        
+        # `kill -HUP <pid>` picks up .env/provider changes without a restart
+        # and drops cached tool results
+        if hasattr(signal, "SIGHUP"):
+            def _on_sighup(signum, frame):
+                reload_config()
+                clear_response_cache()
+            
+            signal.signal(signal.SIGHUP, _on_sighup)
         typer.echo("🚀 Server running on stdio...", err=True)
         typer.echo("   Press Ctrl+C to stop", err=True)
         typer.echo("", err=True)
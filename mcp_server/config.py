@@ -1,14 +1,18 @@
 """Configuration system for Prompt Paladin MCP server."""
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Set, Tuple
 import os
-
-from dotenv import load_dotenv
+import time
 
 from .models import ModelProvider, get_provider
 
+# Project-level .env (the file load_dotenv() would find from this package)
+ENV_FILE = Path(__file__).resolve().parent.parent / ".env"
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProviderConfig:
     """Configuration for a specific provider/model."""
     provider: str
@@ -16,14 +20,32 @@ class ProviderConfig:
     api_key: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Config:
-    """Application configuration loaded from environment."""
+    """Application configuration loaded from environment (immutable)."""
     
     # Feature toggles
     auto_cast_heal: bool = True
     anger_translator: bool = True
     
+    # Answer trivially good/bad prompts in pp_guard without an LLM call
+    fast_path: bool = False
+    
+    # pp_heal (auto mode) returns calm prompts shorter than this unchanged
+    # without an LLM call; 0 disables
+    heal_skip_max_len: int = 0
+    
+    # Warm each provider's API connection at startup (unauthenticated HEAD)
+    preconnect: bool = False
+    
+    # Exact-match cache of parsed LLM results (in-process)
+    response_cache: bool = True
+    response_cache_ttl: float = 900.0
+    
+    # Semantic cache (optional numpy + sentence-transformers)
+    semantic_cache: bool = False
+    semantic_cache_threshold: float = 0.95
+    
     # Default provider settings
     default_provider: str = "anthropic"
     default_model: str = "claude-3-5-sonnet-20241022"
@@ -51,70 +73,182 @@ def _get_api_key_for_provider(provider: str, config: Config) -> Optional[str]:
     return key_map.get(provider)
 
 
+_DOTENV_LOADED = False
+# Variables whose current value came from .env (not the real environment)
+_DOTENV_KEYS: Set[str] = set()
+
+# Provider instances keyed on (tool_name, id(config)). The Config is stored
+# next to its provider so it stays alive and its id is never reused.
+_TOOL_PROVIDERS: Dict[Tuple[str, int], Tuple[Config, ModelProvider]] = {}
+
+
+def _load_dotenv_once() -> None:
+    """
+    Parse the .env file on first use only, if there is one.
+    
+    Like load_dotenv(override=False), real environment variables win over
+    .env; variables that came from .env are remembered so a reload can
+    update or remove them.
+    """
+    global _DOTENV_LOADED
+    if _DOTENV_LOADED:
+        return
+    
+    # Environments that inject variables directly (systemd, docker) have
+    # no .env: skip the dotenv import and its upward directory search
+    values = {}
+    if ENV_FILE.exists():
+        from dotenv import dotenv_values
+        values = {k: v for k, v in dotenv_values(ENV_FILE).items() if v is not None}
+    
+    # Drop .env-provided variables that were removed from the file
+    for key in _DOTENV_KEYS - values.keys():
+        os.environ.pop(key, None)
+    _DOTENV_KEYS.intersection_update(values.keys())
+    
+    for key, value in values.items():
+        if key in _DOTENV_KEYS or key not in os.environ:
+            os.environ[key] = value
+            _DOTENV_KEYS.add(key)
+    _DOTENV_LOADED = True
+
+
+def reload_config() -> None:
+    """
+    Drop the cached Config and providers.
+    
+    The next load_config() re-reads .env and the environment. Installed as
+    the SIGHUP handler by `prompt-paladin serve`.
+    """
+    global _DOTENV_LOADED
+    _DOTENV_LOADED = False
+    _load_config_cached.cache_clear()
+    _TOOL_PROVIDERS.clear()
+
+
+# Tools that accept <TOOL>_PROVIDER / <TOOL>_MODEL overrides
+TOOLS = ("pp_guard", "pp_heal", "pp_suggestions", "pp_discuss")
+
+
+def _as_bool(value: str) -> bool:
+    """Parse a "true"/"false" environment value (case-insensitive)."""
+    return value.lower() == "true"
+
+
+# How often load_config() checks whether .env was edited
+ENV_CHECK_INTERVAL_SECS = 1.0
+
+_env_file_mtime: Optional[int] = None
+_next_env_check = 0.0
+
+
+def _stat_env_file() -> Optional[int]:
+    """mtime (ns) of the .env file, or None if there isn't one."""
+    try:
+        return ENV_FILE.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
 def load_config() -> Config:
     """
     Load configuration from environment variables.
     
+    The (frozen) result is cached and shared by every caller. It is
+    rebuilt when the .env file changes (checked at most once per
+    ENV_CHECK_INTERVAL_SECS) or after reload_config().
+    
     Returns:
         Initialized Config object
         
     Raises:
         ValueError: If required configuration is missing
     """
-    # Load .env file if present
-    load_dotenv()
+    global _env_file_mtime, _next_env_check
+    now = time.monotonic()
+    if now >= _next_env_check:
+        _next_env_check = now + ENV_CHECK_INTERVAL_SECS
+        mtime = _stat_env_file()
+        if mtime != _env_file_mtime:
+            reload_config()
+            _env_file_mtime = mtime
     
-    config = Config()
+    return _load_config_cached()
+
+
+@lru_cache(maxsize=1)
+def _load_config_cached() -> Config:
+    """Build the shared Config (see load_config)."""
+    # Load .env file if present
+    _load_dotenv_once()
     
-    # Load feature toggles
-    config.auto_cast_heal = os.getenv("AUTO_CAST_HEAL", "true").lower() == "true"
-    config.anger_translator = os.getenv("ANGER_TRANSLATOR", "true").lower() == "true"
+    return config_from_env(dict(os.environ))
+
+
+def config_from_env(env: Mapping[str, str]) -> Config:
+    """
+    Build a Config from an environment mapping (uncached).
     
-    # Load default settings
-    config.default_provider = os.getenv("DEFAULT_PROVIDER", "anthropic")
-    config.default_model = os.getenv(
-        "DEFAULT_MODEL", 
-        "claude-3-5-sonnet-20241022"
-    )
+    Args:
+        env: Environment variables, e.g. a snapshot of os.environ
+        
+    Returns:
+        Initialized Config object
+        
+    Raises:
+        ValueError: If required configuration is missing
+    """
+    default_provider = env.get("DEFAULT_PROVIDER", "anthropic")
+    default_model = env.get("DEFAULT_MODEL", "claude-3-5-sonnet-20241022")
     
     # Load API keys
-    config.anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
-    config.openai_api_key = os.getenv("OPENAI_API_KEY")
-    config.groq_api_key = os.getenv("GROQ_API_KEY")
+    api_keys = {
+        "anthropic": env.get("ANTHROPIC_API_KEY"),
+        "openai": env.get("OPENAI_API_KEY"),
+        "groq": env.get("GROQ_API_KEY"),
+    }
+    
+    # Validate at least one API key is set
+    if not any(api_keys.values()):
+        raise ValueError(
+            "At least one API key must be set: "
+            "ANTHROPIC_API_KEY, OPENAI_API_KEY, or GROQ_API_KEY"
+        )
     
-    # Load per-tool overrides
-    tools = ["pp_guard", "pp_heal", "pp_suggestions", "pp_discuss"]
-    for tool in tools:
+    # Load per-tool overrides (only tools whose provider has an API key)
+    tool_configs = {}
+    for tool in TOOLS:
         tool_upper = tool.upper()
-        provider = os.getenv(f"{tool_upper}_PROVIDER", config.default_provider)
-        model = os.getenv(f"{tool_upper}_MODEL", config.default_model)
-        
-        # Get API key for this provider
-        api_key = _get_api_key_for_provider(provider, config)
+        provider = env.get(f"{tool_upper}_PROVIDER", default_provider)
+        model = env.get(f"{tool_upper}_MODEL", default_model)
+        api_key = api_keys.get(provider)
         
         if api_key:
-            config.tool_configs[tool] = ProviderConfig(
+            tool_configs[tool] = ProviderConfig(
                 provider=provider,
                 model=model,
                 api_key=api_key
             )
     
-    # Validate at least one API key is set
-    if not any([
-        config.anthropic_api_key,
-        config.openai_api_key,
-        config.groq_api_key
-    ]):
-        raise ValueError(
-            "At least one API key must be set: "
-            "ANTHROPIC_API_KEY, OPENAI_API_KEY, or GROQ_API_KEY"
-        )
-    
-    # Server settings
-    config.mcp_server_name = os.getenv("MCP_SERVER_NAME", "prompt-paladin")
-    config.log_level = os.getenv("LOG_LEVEL", "INFO")
-    
-    return config
+    return Config(
+        auto_cast_heal=_as_bool(env.get("AUTO_CAST_HEAL", "true")),
+        anger_translator=_as_bool(env.get("ANGER_TRANSLATOR", "true")),
+        fast_path=_as_bool(env.get("FAST_PATH", "false")),
+        heal_skip_max_len=int(env.get("HEAL_SKIP_MAX_LEN", "0")),
+        preconnect=_as_bool(env.get("PRECONNECT", "false")),
+        response_cache=_as_bool(env.get("RESPONSE_CACHE", "true")),
+        response_cache_ttl=float(env.get("RESPONSE_CACHE_TTL_SECS", "900")),
+        semantic_cache=_as_bool(env.get("SEMANTIC_CACHE", "false")),
+        semantic_cache_threshold=float(env.get("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+        default_provider=default_provider,
+        default_model=default_model,
+        anthropic_api_key=api_keys["anthropic"],
+        openai_api_key=api_keys["openai"],
+        groq_api_key=api_keys["groq"],
+        tool_configs=tool_configs,
+        mcp_server_name=env.get("MCP_SERVER_NAME", "prompt-paladin"),
+        log_level=env.get("LOG_LEVEL", "INFO"),
+    )
 
 
 def get_provider_for_tool(tool_name: str, config: Config) -> ModelProvider:
@@ -126,33 +260,35 @@ def get_provider_for_tool(tool_name: str, config: Config) -> ModelProvider:
         config: Application configuration
         
     Returns:
-        Initialized ModelProvider for the tool
+        Initialized ModelProvider for the tool (reused across calls)
     """
+    key = (tool_name, id(config))
+    cached = _TOOL_PROVIDERS.get(key)
+    if cached is not None:
+        return cached[1]
+    
     # Check for tool-specific config
     if tool_name in config.tool_configs:
         tool_config = config.tool_configs[tool_name]
-        return get_provider(
+        provider = get_provider(
             tool_config.provider,
             tool_config.api_key,
             tool_config.model
         )
-    
-    # Fall back to default
-    api_key = _get_api_key_for_provider(config.default_provider, config)
-    if not api_key:
-        raise ValueError(
-            f"No API key configured for default provider: {config.default_provider}"
+    else:
+        # Fall back to default
+        api_key = _get_api_key_for_provider(config.default_provider, config)
+        if not api_key:
+            raise ValueError(
+                f"No API key configured for default provider: {config.default_provider}"
+            )
+        
+        provider = get_provider(
+            config.default_provider,
+            api_key,
+            config.default_model
         )
     
-    return get_provider(
-        config.default_provider,
-        api_key,
-        config.default_model
-    )
-
-
-
-
-
-
+    _TOOL_PROVIDERS[key] = (config, provider)
+    return provider
 
@@ -1,25 +1,86 @@
 """Model provider abstraction for different LLM APIs."""
-from typing import Protocol, Dict, Any
+import atexit
+import importlib.util
+import logging
+import threading
+from typing import Protocol, Dict, Any, Iterator, Tuple
 
-from anthropic import Anthropic
-from openai import OpenAI
+logger = logging.getLogger("prompt_paladin.models")
+
+# The anthropic/openai SDKs (and the httpx/pydantic stacks they pull in) are
+# imported inside each provider's __init__, so commands that never call a
+# model (e.g. `prompt-paladin doctor`) don't pay for them.
+
+# One keep-alive connection pool per provider, built from the SDK's own
+# DefaultHttpxClient so its default timeout (600s, long enough for slow
+# streams), connection limits and redirect handling are kept
+_http_clients: Dict[str, Any] = {}
+_http_clients_lock = threading.Lock()
+
+
+def _provider_http_client(provider_name: str, client_cls):
+    """
+    Get the process-wide httpx client for one provider.
+    
+    Built on first use and shared by every model of that provider. Each
+    provider has its own client, so closing one SDK's client never affects
+    another. HTTP/2 (multiplexed requests on one connection) is enabled
+    when the optional `h2` package is installed.
+    
+    Args:
+        provider_name: Provider the client is for ("anthropic", "openai", "groq")
+        client_cls: The SDK's DefaultHttpxClient
+    """
+    client = _http_clients.get(provider_name)
+    if client is None:
+        with _http_clients_lock:
+            client = _http_clients.get(provider_name)
+            if client is None:
+                client = client_cls(http2=importlib.util.find_spec("h2") is not None)
+                atexit.register(client.close)
+                _http_clients[provider_name] = client
+    return client
+
+
+PRECONNECT_TIMEOUT_SECS = 10.0
+
+
+def _preconnect(http_client, base_url) -> None:
+    """
+    Open a pooled keep-alive connection to an API host.
+    
+    Sends an unauthenticated HEAD so DNS, TCP and TLS are done before the
+    first real request; the status code is irrelevant and a failure only
+    means the first real request pays for the connection itself.
+    """
+    try:
+        http_client.head(str(base_url), timeout=PRECONNECT_TIMEOUT_SECS)
+    except Exception as e:
+        logger.debug("Preconnect to %s failed: %s", base_url, e)
 
 
 class ModelProvider(Protocol):
     """Protocol defining the interface all model providers must implement."""
     
-    def complete(self, prompt: str, system: str = "") -> Dict[str, Any]:
+    def stream(self, prompt: str, system: str = "") -> Iterator[str]:
         """
-        Generate a completion from the model.
+        Generate a completion as a stream of text chunks.
+        
+        Closing the iterator early closes the underlying HTTP response,
+        ending generation.
         
         Args:
             prompt: The user prompt/question
             system: System message to set context
             
-        Returns:
-            Dict with 'content', 'model', and 'provider' keys
+        Yields:
+            Text chunks of the model's reply, in order
         """
         ...
+    
+    def preconnect(self) -> None:
+        """Warm a connection to the provider's API host (best effort)."""
+        ...
 
 
 class ClaudeProvider:
@@ -33,25 +94,52 @@ class ClaudeProvider:
             api_key: Anthropic API key
             model: Model identifier (default: claude-3-5-sonnet-20241022)
         """
-        self.client = Anthropic(api_key=api_key)
+        from anthropic import Anthropic, DefaultHttpxClient
+        
+        self._http_client = _provider_http_client("anthropic", DefaultHttpxClient)
+        self.client = Anthropic(api_key=api_key, http_client=self._http_client)
         self.model = model
     
-    def complete(self, prompt: str, system: str = "") -> Dict[str, Any]:
-        """Generate completion using Claude."""
-        messages = [{"role": "user", "content": prompt}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=2048,
-            system=system if system else None,
-            messages=messages
-        )
-        
-        return {
-            "content": response.content[0].text,
+    def _request_kwargs(self, prompt: str, system: str) -> Dict[str, Any]:
+        """Build the messages.stream arguments."""
+        kwargs = {
             "model": self.model,
-            "provider": "anthropic"
+            "max_tokens": 2048,
+            "messages": [{"role": "user", "content": prompt}],
         }
+        if system:
+            kwargs["system"] = system
+        return kwargs
+    
+    def preconnect(self) -> None:
+        """Warm a connection to the API host ahead of the first call."""
+        _preconnect(self._http_client, self.client.base_url)
+    
+    def stream(self, prompt: str, system: str = "") -> Iterator[str]:
+        """Stream completion text from Claude."""
+        with self.client.messages.stream(**self._request_kwargs(prompt, system)) as stream:
+            yield from stream.text_stream
+
+
+def _stream_chat_completion(client, model: str, prompt: str, system: str) -> Iterator[str]:
+    """Yield content deltas from an OpenAI-compatible streaming chat completion."""
+    messages = []
+    if system:
+        messages.append({"role": "system", "content": system})
+    messages.append({"role": "user", "content": prompt})
+    
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        max_tokens=2048,
+        stream=True
+    )
+    try:
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        stream.close()
 
 
 class OpenAIProvider:
@@ -65,27 +153,19 @@ class OpenAIProvider:
             api_key: OpenAI API key
             model: Model identifier (default: gpt-4o-mini)
         """
-        self.client = OpenAI(api_key=api_key)
+        from openai import DefaultHttpxClient, OpenAI
+        
+        self._http_client = _provider_http_client("openai", DefaultHttpxClient)
+        self.client = OpenAI(api_key=api_key, http_client=self._http_client)
         self.model = model
     
-    def complete(self, prompt: str, system: str = "") -> Dict[str, Any]:
-        """Generate completion using OpenAI."""
-        messages = []
-        if system:
-            messages.append({"role": "system", "content": system})
-        messages.append({"role": "user", "content": prompt})
-        
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            max_tokens=2048
-        )
-        
-        return {
-            "content": response.choices[0].message.content,
-            "model": self.model,
-            "provider": "openai"
-        }
+    def preconnect(self) -> None:
+        """Warm a connection to the API host ahead of the first call."""
+        _preconnect(self._http_client, self.client.base_url)
+    
+    def stream(self, prompt: str, system: str = "") -> Iterator[str]:
+        """Stream completion text from OpenAI."""
+        return _stream_chat_completion(self.client, self.model, prompt, system)
 
 
 class GroqProvider:
@@ -99,35 +179,33 @@ class GroqProvider:
             api_key: Groq API key
             model: Model identifier (default: llama-3.3-70b-versatile)
         """
+        from openai import DefaultHttpxClient, OpenAI
+        
+        self._http_client = _provider_http_client("groq", DefaultHttpxClient)
         self.client = OpenAI(
             api_key=api_key,
-            base_url="https://api.groq.com/openai/v1"
+            base_url="https://api.groq.com/openai/v1",
+            http_client=self._http_client
         )
         self.model = model
     
-    def complete(self, prompt: str, system: str = "") -> Dict[str, Any]:
-        """Generate completion using Groq."""
-        messages = []
-        if system:
-            messages.append({"role": "system", "content": system})
-        messages.append({"role": "user", "content": prompt})
-        
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            max_tokens=2048
-        )
-        
-        return {
-            "content": response.choices[0].message.content,
-            "model": self.model,
-            "provider": "groq"
-        }
+    def preconnect(self) -> None:
+        """Warm a connection to the API host ahead of the first call."""
+        _preconnect(self._http_client, self.client.base_url)
+    
+    def stream(self, prompt: str, system: str = "") -> Iterator[str]:
+        """Stream completion text from Groq."""
+        return _stream_chat_completion(self.client, self.model, prompt, system)
+
+
+# Provider instances keyed on (provider_name, api_key, model), so each
+# SDK client is built once per process (sharing its provider's http client)
+_PROVIDER_CACHE: Dict[Tuple[str, str, str], ModelProvider] = {}
 
 
 def get_provider(provider_name: str, api_key: str, model: str) -> ModelProvider:
     """
-    Factory function to create a model provider instance.
+    Factory function to get a (cached) model provider instance.
     
     Args:
         provider_name: Name of provider ("anthropic", "openai", "groq")
@@ -135,11 +213,17 @@ def get_provider(provider_name: str, api_key: str, model: str) -> ModelProvider:
         model: Model identifier
         
     Returns:
-        Initialized provider instance
+        Initialized provider instance, shared by callers with the same
+        provider, API key and model
         
     Raises:
         ValueError: If provider_name is not supported
     """
+    key = (provider_name, api_key, model)
+    provider = _PROVIDER_CACHE.get(key)
+    if provider is not None:
+        return provider
+    
     providers = {
         "anthropic": ClaudeProvider,
         "openai": OpenAIProvider,
@@ -152,11 +236,7 @@ def get_provider(provider_name: str, api_key: str, model: str) -> ModelProvider:
             f"Supported: {', '.join(providers.keys())}"
         )
     
-    return providers[provider_name](api_key=api_key, model=model)
-
-
-
-
-
-
+    provider = providers[provider_name](api_key=api_key, model=model)
+    # setdefault keeps the first instance if two threads raced to build one
+    return _PROVIDER_CACHE.setdefault(key, provider)
 
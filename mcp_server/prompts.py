@@ -1,5 +1,7 @@
 """System prompts and user prompt templates for Prompt Paladin MCP tools."""
-from typing import Dict, Any, List
+import hashlib
+from functools import singledispatch
+from typing import Dict, Any
 
 
 # ============================================
@@ -173,6 +175,23 @@ RESPONSE FORMAT (JSON):
 Be genuinely curious and helpful, not interrogational."""
 
 
+# System prompts are sent as a byte-identical prefix on every call - never
+# interpolate per-request data into them. At 120-240 words each they are
+# below the 1024-token minimum for Anthropic/OpenAI prompt caching, so no
+# cache_control is sent; that only pays off if a prompt grows past it.
+# Short fingerprints are logged at startup to make prompt changes visible.
+SYSTEM_PROMPT_FINGERPRINTS: Dict[str, str] = {
+    name: hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+    for name, text in (
+        ("PP_GUARD_SYSTEM", PP_GUARD_SYSTEM),
+        ("PP_SUGGESTIONS_SYSTEM", PP_SUGGESTIONS_SYSTEM),
+        ("PP_HEAL_CLARITY_SYSTEM", PP_HEAL_CLARITY_SYSTEM),
+        ("PP_HEAL_ANGER_SYSTEM", PP_HEAL_ANGER_SYSTEM),
+        ("PP_DISCUSS_SYSTEM", PP_DISCUSS_SYSTEM),
+    )
+}
+
+
 # ============================================
 # PART B: USER PROMPT TEMPLATES
 # ============================================
@@ -188,27 +207,13 @@ def format_guard_prompt(user_prompt: str, context: Dict[str, Any]) -> str:
     Returns:
         Formatted prompt string for the LLM
     """
-    parts = ["Evaluate this user prompt for quality:\n"]
-    
-    # Add conversation context if available
-    if context.get("conversation_history"):
-        history_text = _format_history(context["conversation_history"])
-        parts.append(f"CONVERSATION CONTEXT:\n{history_text}\n")
-    
-    # Add the actual user prompt to evaluate
-    parts.append(f"USER PROMPT TO EVALUATE:\n{user_prompt}\n")
-    
-    # Add active files if available
-    if context.get("active_files"):
-        files_list = ", ".join(context["active_files"])
-        parts.append(f"ACTIVE FILES: {files_list}\n")
-    
-    # Add selected code if available
-    if context.get("selected_code"):
-        parts.append(f"SELECTED CODE:\n{context['selected_code']}\n")
-    
-    parts.append("\nProvide your evaluation as JSON.")
-    return "\n".join(parts)
+    return _format_tool_prompt(
+        "Evaluate this user prompt for quality:",
+        "USER PROMPT TO EVALUATE",
+        "Provide your evaluation as JSON.",
+        user_prompt,
+        context
+    )
 
 
 def format_suggestions_prompt(user_prompt: str, context: Dict[str, Any]) -> str:
@@ -222,27 +227,13 @@ def format_suggestions_prompt(user_prompt: str, context: Dict[str, Any]) -> str:
     Returns:
         Formatted prompt string for the LLM
     """
-    parts = ["Generate improved alternatives for this user prompt:\n"]
-    
-    # Add conversation context if available
-    if context.get("conversation_history"):
-        history_text = _format_history(context["conversation_history"])
-        parts.append(f"CONVERSATION CONTEXT:\n{history_text}\n")
-    
-    # Add the original prompt
-    parts.append(f"ORIGINAL PROMPT:\n{user_prompt}\n")
-    
-    # Add active files if available
-    if context.get("active_files"):
-        files_list = ", ".join(context["active_files"])
-        parts.append(f"ACTIVE FILES: {files_list}\n")
-    
-    # Add selected code if available
-    if context.get("selected_code"):
-        parts.append(f"SELECTED CODE:\n{context['selected_code']}\n")
-    
-    parts.append("\nProvide 2-3 improved alternatives as JSON.")
-    return "\n".join(parts)
+    return _format_tool_prompt(
+        "Generate improved alternatives for this user prompt:",
+        "ORIGINAL PROMPT",
+        "Provide 2-3 improved alternatives as JSON.",
+        user_prompt,
+        context
+    )
 
 
 def format_heal_prompt(user_prompt: str, context: Dict[str, Any]) -> str:
@@ -256,27 +247,13 @@ def format_heal_prompt(user_prompt: str, context: Dict[str, Any]) -> str:
     Returns:
         Formatted prompt string for the LLM
     """
-    parts = ["Heal this user prompt:\n"]
-    
-    # Add conversation context if available
-    if context.get("conversation_history"):
-        history_text = _format_history(context["conversation_history"])
-        parts.append(f"CONVERSATION CONTEXT:\n{history_text}\n")
-    
-    # Add the prompt to heal
-    parts.append(f"PROMPT TO HEAL:\n{user_prompt}\n")
-    
-    # Add active files if available
-    if context.get("active_files"):
-        files_list = ", ".join(context["active_files"])
-        parts.append(f"ACTIVE FILES: {files_list}\n")
-    
-    # Add selected code if available
-    if context.get("selected_code"):
-        parts.append(f"SELECTED CODE:\n{context['selected_code']}\n")
-    
-    parts.append("\nProvide the healed prompt as JSON.")
-    return "\n".join(parts)
+    return _format_tool_prompt(
+        "Heal this user prompt:",
+        "PROMPT TO HEAL",
+        "Provide the healed prompt as JSON.",
+        user_prompt,
+        context
+    )
 
 
 def format_discuss_prompt(user_prompt: str, context: Dict[str, Any]) -> str:
@@ -290,49 +267,84 @@ def format_discuss_prompt(user_prompt: str, context: Dict[str, Any]) -> str:
     Returns:
         Formatted prompt string for the LLM
     """
-    parts = ["This user prompt needs clarification:\n"]
-    
-    # Add conversation context if available (important to avoid redundant questions)
-    if context.get("conversation_history"):
-        history_text = _format_history(context["conversation_history"])
-        parts.append(f"CONVERSATION CONTEXT:\n{history_text}\n")
-    
-    # Add the unclear prompt
-    parts.append(f"UNCLEAR PROMPT:\n{user_prompt}\n")
-    
-    # Add active files if available
-    if context.get("active_files"):
-        files_list = ", ".join(context["active_files"])
-        parts.append(f"ACTIVE FILES: {files_list}\n")
-    
-    # Add selected code if available
-    if context.get("selected_code"):
-        parts.append(f"SELECTED CODE:\n{context['selected_code']}\n")
-    
-    parts.append("\nGenerate 2-4 specific clarifying questions as JSON.")
-    return "\n".join(parts)
+    return _format_tool_prompt(
+        "This user prompt needs clarification:",
+        "UNCLEAR PROMPT",
+        "Generate 2-4 specific clarifying questions as JSON.",
+        user_prompt,
+        context
+    )
 
 
 # ============================================
 # HELPER FUNCTIONS
 # ============================================
 
-def _format_history(history: List[str]) -> str:
+def _format_tool_prompt(
+    header: str,
+    label: str,
+    footer: str,
+    user_prompt: str,
+    context: Dict[str, Any]
+) -> str:
+    """
+    Build a tool's user prompt from its fixed wording and the shared context.
+    
+    Args:
+        header: Opening instruction line
+        label: Heading for the user's prompt (e.g. "PROMPT TO HEAL")
+        footer: Closing instruction line
+        user_prompt: The user's prompt
+        context: Context dict with conversation_history, active_files, etc.
+        
+    Returns:
+        Formatted prompt string for the LLM
+    """
+    # Optional sections are empty strings when the context lacks them
+    hist = (
+        f"CONVERSATION CONTEXT:\n{_format_history(history)}\n\n"
+        if (history := context.get("conversation_history")) else ""
+    )
+    files_line = (
+        f"ACTIVE FILES: {', '.join(files)}\n\n"
+        if (files := context.get("active_files")) else ""
+    )
+    code_block = (
+        f"SELECTED CODE:\n{code}\n\n"
+        if (code := context.get("selected_code")) else ""
+    )
+    
+    return (
+        f"{header}\n\n{hist}{label}:\n{user_prompt}\n\n"
+        f"{files_line}{code_block}\n{footer}"
+    )
+
+
+@singledispatch
+def _format_history(history: Any) -> str:
     """
     Format conversation history for inclusion in prompts.
     
+    Dispatches on the type of `history` (one dict lookup instead of a
+    chain of isinstance checks); the overloads below handle lists and
+    already-formatted strings, anything else is stringified.
+    
     Args:
         history: List of conversation messages or summary
         
     Returns:
         Formatted history string
     """
-    if isinstance(history, list):
-        # Join list items with newlines
-        return "\n".join(f"- {item}" for item in history)
-    elif isinstance(history, str):
-        # Already formatted
-        return history
-    else:
-        return str(history)
+    return str(history)
+
+
+@_format_history.register
+def _(history: list) -> str:
+    # One C-level join; no per-item f-string or generator frame
+    return "- " + "\n- ".join(map(str, history)) if history else ""
+
 
+@_format_history.register
+def _(history: str) -> str:
+    # Already formatted
+    return history
@@ -0,0 +1,194 @@
+"""Semantic (near-duplicate) cache for LLM tool results.
+
+Reuses a stored result when a new prompt's sentence embedding is close
+enough (cosine similarity >= threshold) to one seen before under the same
+scope (tool, model, system prompt and context), so rewordings like
+"fix this bug" / "please fix the bug" skip the LLM round-trip. Only
+pp-guard consults it (see tools.SEMANTIC_CACHE_TOOLS).
+
+Requires the optional `numpy` and `sentence-transformers` packages; when
+they are missing the cache reports itself unavailable and tools fall back
+to the exact-match cache only.
+"""
+import importlib.util
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("prompt_paladin.semantic_cache")
+
+SEMANTIC_CACHE_MODEL = "all-MiniLM-L6-v2"
+SEMANTIC_CACHE_MAXLEN = 2048
+SEMANTIC_CACHE_FILE = Path.home() / ".prompt_paladin" / "sem_cache.npz"
+
+
+def is_available() -> bool:
+    """Check whether the optional embedding dependencies are installed."""
+    return (
+        importlib.util.find_spec("numpy") is not None
+        and importlib.util.find_spec("sentence_transformers") is not None
+    )
+
+
+class SemanticCache:
+    """
+    Thread-safe LRU of tool results indexed by normalized prompt embeddings.
+
+    Embeddings live in one preallocated float32 matrix, so a lookup is a
+    single matrix-vector product over the stored rows.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        maxlen: int = SEMANTIC_CACHE_MAXLEN,
+        model_name: str = SEMANTIC_CACHE_MODEL,
+        path: Optional[Path] = SEMANTIC_CACHE_FILE,
+    ):
+        import numpy as np
+
+        self.threshold = threshold
+        self.maxlen = maxlen
+        self.model_name = model_name
+        self.path = path
+        self._np = np
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+        # Row i of _embeddings belongs to _scopes[i] / _results[i];
+        # _last_used holds a logical clock for LRU eviction
+        self._embeddings = None
+        self._scopes: List[bytes] = []
+        self._results: List[Dict[str, Any]] = []
+        self._last_used = np.zeros(maxlen, dtype=np.int64)
+        self._clock = 0
+
+    def encode(self, prompt: str):
+        """
+        Embed a prompt as an L2-normalized float32 vector.
+
+        Callers encode once and pass the vector to both get() and put(), so
+        a miss doesn't run the model twice.
+        """
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+
+                    logger.info("Loading embedding model %s", self.model_name)
+                    self._model = SentenceTransformer(self.model_name)
+        return self._model.encode(prompt, normalize_embeddings=True).astype(self._np.float32)
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def get(self, scope: bytes, emb) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """
+        Find the most similar stored prompt under the same scope.
+
+        Args:
+            scope: Scope key (tool, model, system prompt and context)
+            emb: Prompt embedding from encode()
+
+        Returns:
+            (similarity, result) if one reaches the threshold, None otherwise
+        """
+        np = self._np
+        with self._lock:
+            count = len(self._scopes)
+            if not count:
+                return None
+            sims = self._embeddings[:count] @ emb
+            # Only rows from the same tool/model/system/context may match
+            mask = np.fromiter((s == scope for s in self._scopes), dtype=bool, count=count)
+            sims = np.where(mask, sims, -1.0)
+            best = int(np.argmax(sims))
+            similarity = float(sims[best])
+            if similarity < self.threshold:
+                return None
+            self._last_used[best] = self._tick()
+            return similarity, self._results[best]
+
+    def put(self, scope: bytes, emb, result: Dict[str, Any]) -> None:
+        """Store a result under an encode() embedding, evicting the LRU entry if full."""
+        np = self._np
+        with self._lock:
+            if self._embeddings is None:
+                self._embeddings = np.zeros((self.maxlen, emb.shape[0]), dtype=np.float32)
+
+            if len(self._scopes) < self.maxlen:
+                row = len(self._scopes)
+                self._scopes.append(scope)
+                self._results.append(result)
+            else:
+                row = int(np.argmin(self._last_used))
+                self._scopes[row] = scope
+                self._results[row] = result
+            self._embeddings[row] = emb
+            self._last_used[row] = self._tick()
+
+    def load(self) -> None:
+        """Load entries saved by a previous process (best effort)."""
+        if self.path is None:
+            return
+        np = self._np
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if str(data["model"]) != self.model_name:
+                    return
+                embeddings = data["embeddings"]
+                scopes = [row.tobytes() for row in data["scopes"]]
+                results = [json.loads(r) for r in data["results"]]
+                last_used = data["last_used"]
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Ignoring unreadable semantic cache %s: %s", self.path, e)
+            return
+
+        # Keep the most recently used entries if maxlen shrank
+        keep = np.argsort(last_used)[-self.maxlen:]
+        with self._lock:
+            self._embeddings = np.zeros((self.maxlen, embeddings.shape[1]), dtype=np.float32)
+            self._embeddings[:len(keep)] = embeddings[keep]
+            self._scopes = [scopes[i] for i in keep]
+            self._results = [results[i] for i in keep]
+            self._last_used[:len(keep)] = last_used[keep]
+            self._clock = int(last_used.max(initial=0))
+        logger.info("Loaded %d semantic cache entries", len(keep))
+
+    def save(self) -> None:
+        """Persist entries atomically with owner-only permissions."""
+        if self.path is None:
+            return
+        np = self._np
+        with self._lock:
+            count = len(self._scopes)
+            if not count:
+                return
+            arrays = {
+                "model": np.array(self.model_name),
+                "embeddings": self._embeddings[:count].copy(),
+                "scopes": np.frombuffer(b"".join(self._scopes), dtype=np.uint8).reshape(count, -1),
+                "results": np.array([json.dumps(r) for r in self._results]),
+                "last_used": self._last_used[:count].copy(),
+            }
+
+        temp_path = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            temp_path.replace(self.path)
+        except Exception as e:
+            logger.warning("Could not save semantic cache %s: %s", self.path, e)
+            try:
+                temp_path.unlink()
+            except FileNotFoundError:
+                pass
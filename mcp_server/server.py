@@ -1,10 +1,12 @@
 """FastMCP server for Prompt Paladin."""
+import asyncio
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from fastmcp import FastMCP
 from typing import Optional, Dict, Any
 
-from .tools import pp_guard, pp_suggestions, pp_heal, pp_discuss, pp_proceed
+from .tools import pp_guard, pp_guard_with_heal, pp_analyze, pp_suggestions, pp_heal, pp_discuss, pp_proceed
 
 # Setup logging for MCP server
 logging.basicConfig(
@@ -19,9 +21,21 @@ logging.basicConfig(
 # Initialize MCP server
 mcp = FastMCP("prompt-paladin")
 
+# The tools make blocking LLM calls through the synchronous SDK clients.
+# Tools are async and hand that work to this bounded pool, so the event
+# loop keeps serving other requests while calls are in flight (and all of
+# them share the pooled HTTP client's keep-alive connections).
+TOOL_WORKERS = 16
+_executor = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="pp-tool")
+
+
+async def _run(fn, *args) -> Dict[str, Any]:
+    """Run a blocking tool function on the shared worker pool."""
+    return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+
 
 @mcp.tool()
-def pp_guard_tool(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+async def pp_guard_tool(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Evaluate prompt quality and determine if it should proceed, be healed, or require intervention.
     
@@ -32,11 +46,46 @@ def pp_guard_tool(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict
     Returns:
         Evaluation result with verdict, reason, confidence, issues
     """
-    return pp_guard(prompt, context)
+    return await _run(pp_guard, prompt, context)
+
+
+@mcp.tool()
+async def pp_guard_plus_heal_tool(
+    prompt: str,
+    context: Optional[Dict[str, Any]] = None,
+    mode: str = "auto"
+) -> Dict[str, Any]:
+    """
+    Evaluate prompt quality and heal it in parallel, in one call.
+    
+    Args:
+        prompt: The user prompt to evaluate
+        context: Optional context including conversation_history, active_files, selected_code, etc.
+        mode: Healing mode - "clarity", "anger", or "auto" (default)
+    
+    Returns:
+        {"guard": evaluation result, "heal": healed prompt result, or null if the verdict is "proceed"}
+    """
+    return await _run(pp_guard_with_heal, prompt, context, mode)
+
+
+@mcp.tool()
+async def pp_analyze_tool(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Evaluate prompt quality and generate improved alternatives in one call.
+    
+    Args:
+        prompt: The user prompt to analyze
+        context: Optional context including conversation_history, active_files, selected_code, etc.
+    
+    Returns:
+        {"guard": evaluation result, "suggestions": alternatives result}
+    """
+    return await _run(pp_analyze, prompt, context)
 
 
 @mcp.tool()
-def pp_suggestions_tool(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+async def pp_suggestions_tool(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Generate 2-3 improved alternatives to the given prompt.
     
@@ -47,11 +96,11 @@ def pp_suggestions_tool(prompt: str, context: Optional[Dict[str, Any]] = None) -
     Returns:
         List of improved prompt suggestions with explanations
     """
-    return pp_suggestions(prompt, context)
+    return await _run(pp_suggestions, prompt, context)
 
 
 @mcp.tool()
-def pp_heal_tool(
+async def pp_heal_tool(
     prompt: str,
     mode: str = "auto",
     context: Optional[Dict[str, Any]] = None
@@ -67,11 +116,11 @@ def pp_heal_tool(
     Returns:
         Healed prompt with list of changes made
     """
-    return pp_heal(prompt, mode, context)
+    return await _run(pp_heal, prompt, mode, context)
 
 
 @mcp.tool()
-def pp_discuss_tool(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+async def pp_discuss_tool(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Generate clarifying questions for unclear prompts.
     
@@ -82,7 +131,7 @@ def pp_discuss_tool(prompt: str, context: Optional[Dict[str, Any]] = None) -> Di
     Returns:
         List of specific questions to clarify user intent
     """
-    return pp_discuss(prompt, context)
+    return await _run(pp_discuss, prompt, context)
 
 
 @mcp.tool()
@@ -1,16 +1,28 @@
 """MCP tool implementations for Prompt Paladin."""
+import atexit
+import copy
+import hashlib
 import json
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
-from .config import load_config, get_provider_for_tool
+from . import semantic_cache
+from .config import TOOLS, Config, load_config, get_provider_for_tool
 from .prompts import (
     PP_GUARD_SYSTEM,
     PP_SUGGESTIONS_SYSTEM,
     PP_HEAL_CLARITY_SYSTEM,
     PP_HEAL_ANGER_SYSTEM,
     PP_DISCUSS_SYSTEM,
+    SYSTEM_PROMPT_FINGERPRINTS,
     format_guard_prompt,
     format_suggestions_prompt,
     format_heal_prompt,
@@ -20,6 +32,25 @@ from .prompts import (
 # Setup logger for MCP tools
 logger = logging.getLogger("prompt_paladin.tools")
 
+# orjson parses several times faster than stdlib json (str input is read
+# directly); its JSONDecodeError subclasses json.JSONDecodeError
+try:
+    import orjson
+    
+    _loads = orjson.loads
+    
+    def _canonical_json(obj) -> bytes:
+        """Deterministic (sorted-key) JSON encoding, for hashing."""
+        return orjson.dumps(
+            obj, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+except ImportError:
+    _loads = json.loads
+    
+    def _canonical_json(obj) -> bytes:
+        """Deterministic (sorted-key) JSON encoding, for hashing."""
+        return json.dumps(obj, sort_keys=True, default=str).encode("utf-8")
+
 
 def truncate_prompt(text: str, max_len: int = 500) -> str:
     """
@@ -32,9 +63,30 @@ def truncate_prompt(text: str, max_len: int = 500) -> str:
     Returns:
         Truncated text with ellipsis if needed
     """
-    if len(text) <= max_len:
-        return text
-    return text[:max_len] + "..."
+    return text if len(text) <= max_len else f"{text[:max_len]}..."
+
+
+class _Truncated:
+    """Log argument that runs truncate_prompt only if the record is emitted."""
+    __slots__ = ("text", "max_len")
+    
+    def __init__(self, text: str, max_len: int):
+        self.text = text
+        self.max_len = max_len
+    
+    def __str__(self) -> str:
+        return truncate_prompt(self.text, self.max_len)
+
+
+class _Joined:
+    """Log argument that joins a list with ", " only if the record is emitted."""
+    __slots__ = ("items",)
+    
+    def __init__(self, items):
+        self.items = items
+    
+    def __str__(self) -> str:
+        return ", ".join(self.items)
 
 
 def extract_json_from_response(content: str) -> str:
@@ -52,24 +104,538 @@ def extract_json_from_response(content: str) -> str:
     """
     content = content.strip()
     
-    # Check for markdown code blocks
-    if content.startswith("```"):
-        # Remove opening fence (```json or ```)
-        lines = content.split('\n')
-        # Remove first line (```json or ```)
-        lines = lines[1:]
-        # Remove last line if it's closing fence (```)
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        content = '\n'.join(lines).strip()
+    # Fast path: no markdown fence, nothing to copy
+    if not content.startswith("```"):
+        return content
+    
+    # Remove opening fence line (```json or ```)
+    first_nl = content.find("\n")
+    if first_nl == -1:
+        return ""
+    body = content[first_nl + 1:]
+    
+    # Remove last line if it's the closing fence (```)
+    last_nl = body.rfind("\n")
+    if body[last_nl + 1:].strip() == "```":
+        body = body[:last_nl] if last_nl != -1 else ""
+    
+    return body.strip()
+
+
+def read_json_from_stream(chunks: Iterable[str]) -> str:
+    """
+    Read streamed LLM output up to the end of its first JSON object.
+    
+    Brace depth is tracked (ignoring braces inside JSON strings) as chunks
+    arrive, and reading stops as soon as the top-level object closes, so
+    a closing fence or trailing commentary is never waited for. Fenced
+    replies work too, since everything before the first "{" is skipped.
+    
+    Args:
+        chunks: Text chunks of the response, in order (closed on early stop)
+        
+    Returns:
+        The JSON object text, or the whole response cleaned up with
+        extract_json_from_response if no complete object was seen
+    """
+    parts = []
+    start = None  # (part index, offset) of the opening brace
+    depth = 0
+    in_string = False
+    escaped = False
+    
+    try:
+        for chunk in chunks:
+            parts.append(chunk)
+            for i, ch in enumerate(chunk):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == "\\":
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == "{":
+                    if start is None:
+                        start = (len(parts) - 1, i)
+                    depth += 1
+                elif start is None:
+                    continue
+                elif ch == '"':
+                    in_string = True
+                elif ch == "}":
+                    depth -= 1
+                    if depth == 0:
+                        first, offset = start
+                        parts[-1] = chunk[:i + 1]
+                        return "".join(parts[first:])[offset:]
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+    
+    return extract_json_from_response("".join(parts))
+
+
+def _log_first_chunk(chunks: Iterator[str], start_ns: int) -> Iterator[str]:
+    """
+    Pass a response stream through, logging time to its first chunk.
+    
+    Time to first token (queueing plus prompt processing) is reported
+    separately from the total, which also includes generation.
+    """
+    try:
+        for chunk in chunks:
+            logger.info("LLM first token after %.3fs", (time.perf_counter_ns() - start_ns) / 1e9)
+            yield chunk
+            break
+        yield from chunks
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def log_system_prompt_fingerprints() -> None:
+    """Log a short hash of each system prompt (prompt-cache prefixes)."""
+    for name, fingerprint in SYSTEM_PROMPT_FINGERPRINTS.items():
+        logger.info("System prompt %s: %s", name, fingerprint)
+
+
+# ============================================
+# Response Cache (exact match)
+# ============================================
+
+RESPONSE_CACHE_MAXLEN = 512
+RESPONSE_CACHE_TTL_SECS = 900
+
+
+@lru_cache(maxsize=16)
+def _system_digest(system: str) -> bytes:
+    """
+    Digest of a system prompt, computed once per distinct prompt.
+    
+    The system prompts are a handful of multi-KB constants, so cache keys
+    mix in this digest instead of re-encoding and re-hashing them per call.
+    """
+    return hashlib.blake2b(system.encode("utf-8"), digest_size=16).digest()
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU of parsed LLM results with a time-to-live.
+    
+    Keyed by tool, model, system prompt and the formatted user prompt, so
+    any change in context produces a new entry.
+    """
+    
+    def __init__(self, maxlen: int = RESPONSE_CACHE_MAXLEN, ttl: float = RESPONSE_CACHE_TTL_SECS):
+        self.maxlen = maxlen
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(tool: str, model: str, system: str, user_prompt: str) -> bytes:
+        """16-byte BLAKE2b digest of the request."""
+        h = hashlib.blake2b(f"{tool}\0{model}\0".encode("utf-8"), digest_size=16)
+        h.update(_system_digest(system))
+        h.update(user_prompt.encode("utf-8"))
+        return h.digest()
+    
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if now - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key: bytes, result: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxlen:
+                self._entries.popitem(last=False)
+            # Entries are in LRU order, so expired ones are usually at the front
+            while self._entries:
+                oldest_key, (stored_at, _) = next(iter(self._entries.items()))
+                if now - stored_at <= self.ttl:
+                    break
+                del self._entries[oldest_key]
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def load(self, path: Path) -> None:
+        """
+        Load unexpired entries written by save() (best effort).
+        
+        Ages are stored against the wall clock, so they survive a restart.
+        """
+        try:
+            with open(path, "rb") as f:
+                saved = _loads(f.read())
+            now, wall_now = time.monotonic(), time.time()
+            entries = [
+                (bytes.fromhex(key), (now - (wall_now - saved_at), result))
+                for key, saved_at, result in saved["entries"][-self.maxlen:]
+                if wall_now - saved_at <= self.ttl and isinstance(result, dict)
+            ]
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Ignoring unreadable response cache %s: %s", path, e)
+            return
+        
+        with self._lock:
+            self._entries.update(entries)
+            while len(self._entries) > self.maxlen:
+                self._entries.popitem(last=False)
+        logger.info("Loaded %d cached responses from %s", len(entries), path)
+    
+    def save(self, path: Path) -> None:
+        """Persist entries as JSON (fsync + atomic rename, owner-only permissions)."""
+        now, wall_now = time.monotonic(), time.time()
+        with self._lock:
+            saved = {
+                "entries": [
+                    [key.hex(), wall_now - (now - stored_at), result]
+                    for key, (stored_at, result) in self._entries.items()
+                ],
+            }
+        
+        temp_path = path.with_suffix(".tmp")
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(_canonical_json(saved))
+                f.flush()
+                os.fsync(f.fileno())
+            temp_path.replace(path)
+            dir_fd = os.open(path.parent, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError as e:
+            logger.warning("Could not save response cache %s: %s", path, e)
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+
+
+_RESPONSE_CACHE = ResponseCache()
+
+
+def _get_response_cache(config: Config) -> Optional[ResponseCache]:
+    """Get the exact-match cache, or None if RESPONSE_CACHE=false."""
+    if not config.response_cache:
+        return None
+    # RESPONSE_CACHE_TTL_SECS may change on a config reload
+    _RESPONSE_CACHE.ttl = config.response_cache_ttl
+    return _RESPONSE_CACHE
+
+
+def clear_response_cache() -> None:
+    """Drop all exact-match cached results (e.g. after changing prompts or models)."""
+    _RESPONSE_CACHE.clear()
+
+
+def load_response_cache(path: Path) -> None:
+    """Reload results saved by save_response_cache() (no-op if RESPONSE_CACHE=false)."""
+    try:
+        cache = _get_response_cache(load_config())
+    except Exception as e:
+        logger.warning("Not loading response cache: %s", e)
+        return
+    if cache is not None:
+        cache.load(path)
+
+
+def save_response_cache(path: Path) -> None:
+    """Persist the exact-match cache, e.g. when a long-lived worker exits."""
+    try:
+        cache = _get_response_cache(load_config())
+    except Exception as e:
+        logger.warning("Not saving response cache: %s", e)
+        return
+    if cache is not None:
+        cache.save(path)
+
+
+# Tools whose results may be reused for a reworded prompt. Only pp-guard's
+# verdict is prompt-independent enough; pp-heal/pp-suggestions/pp-discuss
+# echo the prompt back, so "fix foo.py" must never get "fix bar.py"'s reply
+SEMANTIC_CACHE_TOOLS = frozenset({"pp_guard"})
+
+_semantic_cache: Optional["semantic_cache.SemanticCache"] = None
+_semantic_cache_lock = threading.Lock()
+_semantic_cache_checked = False
+
+
+def _get_semantic_cache(config: Config) -> Optional["semantic_cache.SemanticCache"]:
+    """
+    Get the process-wide semantic cache if enabled and its deps are installed.
+    
+    Built (and loaded from disk) on first use; saved again at exit. The
+    similarity threshold follows the current config, so a reload applies.
+    """
+    global _semantic_cache, _semantic_cache_checked
+    if not config.semantic_cache:
+        return None
+    if not _semantic_cache_checked:
+        with _semantic_cache_lock:
+            if not _semantic_cache_checked:
+                if semantic_cache.is_available():
+                    cache = semantic_cache.SemanticCache(threshold=config.semantic_cache_threshold)
+                    cache.load()
+                    atexit.register(cache.save)
+                    _semantic_cache = cache
+                else:
+                    logger.warning(
+                        "SEMANTIC_CACHE=true but numpy/sentence-transformers are not "
+                        "installed; using exact-match caching only"
+                    )
+                _semantic_cache_checked = True
+    if _semantic_cache is not None:
+        _semantic_cache.threshold = config.semantic_cache_threshold
+    return _semantic_cache
+
+
+def _semantic_scope(tool: str, model: str, system: str, context: Optional[Dict[str, Any]]) -> bytes:
+    """Digest of everything but the prompt; only matching scopes may share results."""
+    context_json = _canonical_json(context or {}).decode("utf-8")
+    return ResponseCache.key(tool, model, system, context_json)
+
+
+# Identical requests currently waiting on the LLM, keyed like ResponseCache
+_INFLIGHT: Dict[bytes, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _complete_json(
+    tool: str,
+    provider,
+    system: str,
+    user_prompt: str,
+    prompt: Optional[str] = None,
+    context: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Call the provider and parse its JSON reply, reusing earlier requests.
+    
+    Identical requests are served from the exact-match cache, and identical
+    requests made while one is already in flight wait for and share its
+    result instead of issuing their own call. When `prompt` is given, the
+    tool is in SEMANTIC_CACHE_TOOLS and the semantic cache is enabled, a
+    close rewording of an earlier prompt with the same context is also
+    served from cache.
     
-    return content
+    Args:
+        tool: Tool name (part of the cache key)
+        provider: ModelProvider for the tool
+        system: System prompt
+        user_prompt: Formatted user prompt
+        prompt: Raw user prompt, to enable semantic lookups
+        context: Context the user prompt was formatted with
+        
+    Returns:
+        Parsed result (a private copy the caller may modify)
+        
+    Raises:
+        Exception: Provider or JSON errors (failures are never cached)
+    """
+    config = load_config()
+    response_cache = _get_response_cache(config)
+    model = getattr(provider, "model", "")
+    key = ResponseCache.key(tool, model, system, user_prompt)
+    if response_cache is not None:
+        cached = response_cache.get(key)
+        if cached is not None:
+            logger.info("%s: response cache hit", tool)
+            return copy.deepcopy(cached)
+    
+    with _inflight_lock:
+        future = _INFLIGHT.get(key)
+        leader = future is None
+        if leader:
+            future = _INFLIGHT[key] = Future()
+    
+    if not leader:
+        logger.info("%s: sharing an identical in-flight request", tool)
+        return copy.deepcopy(future.result())
+    
+    try:
+        stored = _fetch_json(tool, provider, model, system, user_prompt, prompt, context, config)
+        if response_cache is not None:
+            response_cache.put(key, stored)
+        future.set_result(stored)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _INFLIGHT[key]
+    return copy.deepcopy(stored)
+
+
+def _fetch_json(
+    tool: str,
+    provider,
+    model: str,
+    system: str,
+    user_prompt: str,
+    prompt: Optional[str],
+    context: Optional[Dict[str, Any]],
+    config: Config,
+) -> Dict[str, Any]:
+    """Get a result from the semantic cache or the LLM (see _complete_json)."""
+    use_semantic = prompt is not None and tool in SEMANTIC_CACHE_TOOLS
+    sem_cache = _get_semantic_cache(config) if use_semantic else None
+    if sem_cache is not None:
+        scope = _semantic_scope(tool, model, system, context)
+        try:
+            # Encoded once; the same vector is stored on a miss
+            embedding = sem_cache.encode(prompt)
+            hit = sem_cache.get(scope, embedding)
+        except Exception as e:
+            logger.warning("%s: semantic cache lookup failed: %s", tool, e)
+            hit = sem_cache = None
+        if hit is not None:
+            similarity, result = hit
+            logger.info("%s: semantic cache hit (similarity %.3f)", tool, similarity)
+            return result
+    
+    # Stream the reply and stop reading once its JSON object is complete
+    llm_start_ns = time.perf_counter_ns()
+    chunks = _log_first_chunk(provider.stream(user_prompt, system), llm_start_ns)
+    clean_json = read_json_from_stream(chunks)
+    llm_elapsed = (time.perf_counter_ns() - llm_start_ns) / 1e9
+    logger.info("LLM call completed in %.3fs", llm_elapsed)
+    
+    logger.debug("Response JSON length: %d", len(clean_json))
+    result = _loads(clean_json)
+    
+    if sem_cache is not None:
+        try:
+            sem_cache.put(scope, embedding, result)
+        except Exception as e:
+            logger.warning("%s: semantic cache store failed: %s", tool, e)
+    return result
+
+
+# ============================================
+# Shared tool scaffolding
+# ============================================
+
+def _log_tool_start(message: str, label: str, prompt: str, *args) -> None:
+    """Log a tool's header block (skipped entirely when INFO is filtered)."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("=" * 60)
+        logger.info(message, *args)
+        logger.info("%s [500 chars]: %s", label, _Truncated(prompt, 500))
+
+
+def _log_tool_error(tool: str, start_ns: int, error: Exception) -> None:
+    """Log a tool failure with its elapsed time and traceback."""
+    elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+    logger.error("%s error after %.3fs: %s", tool, elapsed, error, exc_info=True)
+    logger.info("=" * 60)
+
+
+def _run_tool_llm(
+    tool: str,
+    config: Config,
+    system: str,
+    format_prompt: Callable[[str, Dict[str, Any]], str],
+    prompt: str,
+    context: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Format a tool's user prompt and get the parsed JSON reply.
+    
+    Args:
+        tool: Tool name (selects the provider; part of the cache key)
+        config: Application configuration
+        system: System prompt
+        format_prompt: The tool's format_*_prompt function
+        prompt: The user's prompt
+        context: Optional context
+        
+    Returns:
+        Parsed result (a private copy the caller may modify)
+    """
+    provider = get_provider_for_tool(tool, config)
+    
+    # Use paired template + system prompt
+    user_prompt = format_prompt(prompt, context or {})
+    
+    # Call LLM (or reuse an identical earlier call) and parse its JSON
+    return _complete_json(
+        tool, provider, system, user_prompt,
+        prompt=prompt, context=context
+    )
 
 
 # ============================================
 # pp-guard: Primary Gatekeeper
 # ============================================
 
+TRIAGE_MIN_LEN = 3
+TRIAGE_PROCEED_MIN_LEN = 50
+TRIAGE_PROCEED_MIN_SPACES = 7
+
+# Concrete coding actions/targets that make a longer prompt actionable
+_TRIAGE_ACTION_RE = re.compile(
+    r"\b(?:refactor|add|fix the|implement|function|class|error)\b",
+    re.IGNORECASE
+)
+
+
+def _triage_prompt(prompt: str) -> Optional[Dict[str, Any]]:
+    """
+    Decide obvious cases without the LLM (enabled by FAST_PATH=true).
+    
+    Args:
+        prompt: The user's prompt
+        
+    Returns:
+        A pp_guard result for near-empty prompts ("intervene") and long,
+        specific, non-hostile ones ("proceed"); None if the LLM should decide
+    """
+    if len(prompt.strip()) < TRIAGE_MIN_LEN:
+        return {
+            "verdict": "intervene",
+            "reason": "Prompt too short",
+            "confidence": 0.95,
+            "issues": ["empty_prompt"],
+            "suggestions": "Please describe what you want to do."
+        }
+    
+    if (
+        len(prompt) > TRIAGE_PROCEED_MIN_LEN
+        and prompt.count(" ") >= TRIAGE_PROCEED_MIN_SPACES
+        and _TRIAGE_ACTION_RE.search(prompt) is not None
+        and not _has_negative_tone(prompt)
+    ):
+        return {
+            "verdict": "proceed",
+            "reason": "Specific, actionable prompt (fast path)",
+            "confidence": 0.8,
+            "issues": []
+        }
+    
+    return None
+
+
 def pp_guard(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Evaluate prompt quality and determine next action.
@@ -81,57 +647,44 @@ def pp_guard(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict[str,
     Returns:
         Dict with verdict, reason, confidence, issues, suggestions
     """
-    start_time = datetime.now()
-    logger.info("=" * 60)
-    logger.info("pp_guard: Starting prompt evaluation")
-    logger.info(f"Prompt [500 chars]: {truncate_prompt(prompt, 500)}")
+    start_ns = time.perf_counter_ns()
+    _log_tool_start("pp_guard: Starting prompt evaluation", "Prompt", prompt)
     
     try:
         config = load_config()
-        provider = get_provider_for_tool("pp_guard", config)
-        
-        # Use paired template + system prompt
-        user_prompt = format_guard_prompt(prompt, context or {})
-        
-        # Call LLM with paired prompts
-        llm_start = datetime.now()
-        response = provider.complete(user_prompt, PP_GUARD_SYSTEM)
-        llm_elapsed = (datetime.now() - llm_start).total_seconds()
-        logger.info(f"LLM call completed in {llm_elapsed:.3f}s")
         
-        # Extract and parse JSON from response
-        response_content = response.get("content", "")
-        logger.debug(f"Response content length: {len(response_content)}")
+        if config.fast_path:
+            triaged = _triage_prompt(prompt)
+            if triaged is not None:
+                logger.info("pp_guard fast path: %s", triaged["verdict"])
+                logger.info("=" * 60)
+                return triaged
         
-        # Handle markdown code blocks (```json ... ```)
-        clean_json = extract_json_from_response(response_content)
-        logger.debug(f"Clean JSON length: {len(clean_json)}")
+        result = _run_tool_llm(
+            "pp_guard", config, PP_GUARD_SYSTEM, format_guard_prompt, prompt, context
+        )
         
-        # Parse JSON
-        result = json.loads(clean_json)
-        
-        # Ensure required fields exist
-        result.setdefault("verdict", "intervene")
-        result.setdefault("confidence", 0.5)
-        result.setdefault("issues", [])
-        result.setdefault("reason", "No reason provided")
+        # Ensure required fields exist (setdefault also returns each value)
+        verdict = result.setdefault("verdict", "intervene")
+        confidence = result.setdefault("confidence", 0.5)
+        issues = result.setdefault("issues", [])
+        reason = result.setdefault("reason", "No reason provided")
         
         # Log results
-        elapsed = (datetime.now() - start_time).total_seconds()
-        logger.info(f"pp_guard completed in {elapsed:.3f}s")
-        logger.info(f"Verdict: {result['verdict']} | Confidence: {result['confidence']:.2f}")
-        logger.info(f"Reason: {result['reason']}")
-        if result['issues']:
-            logger.info(f"Issues: {', '.join(result['issues'])}")
-        logger.info("=" * 60)
+        if logger.isEnabledFor(logging.INFO):
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+            logger.info("pp_guard completed in %.3fs", elapsed)
+            logger.info("Verdict: %s | Confidence: %.2f", verdict, confidence)
+            logger.info("Reason: %s", reason)
+            if issues:
+                logger.info("Issues: %s", _Joined(issues))
+            logger.info("=" * 60)
         
         return result
         
     except Exception as e:
         # CRITICAL: Fail open - never block prompts due to evaluation errors
-        elapsed = (datetime.now() - start_time).total_seconds()
-        logger.error(f"pp_guard error after {elapsed:.3f}s: {e}", exc_info=True)
-        logger.info("=" * 60)
+        _log_tool_error("pp_guard", start_ns, e)
         return {
             "verdict": "proceed",
             "reason": f"Error during evaluation: {str(e)}",
@@ -156,47 +709,32 @@ def pp_suggestions(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dic
     Returns:
         Dict with suggestions array
     """
-    start_time = datetime.now()
-    logger.info("=" * 60)
-    logger.info("pp_suggestions: Generating prompt alternatives")
-    logger.info(f"Original prompt [500 chars]: {truncate_prompt(prompt, 500)}")
+    start_ns = time.perf_counter_ns()
+    _log_tool_start("pp_suggestions: Generating prompt alternatives", "Original prompt", prompt)
     
     try:
-        config = load_config()
-        provider = get_provider_for_tool("pp_suggestions", config)
-        
-        # Use paired template + system prompt
-        user_prompt = format_suggestions_prompt(prompt, context or {})
-        
-        # Call LLM with paired prompts
-        llm_start = datetime.now()
-        response = provider.complete(user_prompt, PP_SUGGESTIONS_SYSTEM)
-        llm_elapsed = (datetime.now() - llm_start).total_seconds()
-        logger.info(f"LLM call completed in {llm_elapsed:.3f}s")
-        
-        # Extract and parse JSON (handle markdown code blocks)
-        clean_json = extract_json_from_response(response["content"])
-        result = json.loads(clean_json)
+        result = _run_tool_llm(
+            "pp_suggestions", load_config(), PP_SUGGESTIONS_SYSTEM,
+            format_suggestions_prompt, prompt, context
+        )
         
         # Ensure suggestions field exists
-        result.setdefault("suggestions", [])
+        suggestions = result.setdefault("suggestions", [])
         
         # Log results
-        elapsed = (datetime.now() - start_time).total_seconds()
-        suggestions = result['suggestions']
-        logger.info(f"pp_suggestions completed in {elapsed:.3f}s")
-        logger.info(f"Generated {len(suggestions)} suggestion(s)")
-        for i, suggestion in enumerate(suggestions, 1):
-            logger.info(f"Suggestion {i}: {truncate_prompt(suggestion.get('prompt', ''), 200)}")
-        logger.info("=" * 60)
+        if logger.isEnabledFor(logging.INFO):
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+            logger.info("pp_suggestions completed in %.3fs", elapsed)
+            logger.info("Generated %d suggestion(s)", len(suggestions))
+            for i, suggestion in enumerate(suggestions, 1):
+                logger.info("Suggestion %d: %s", i, _Truncated(suggestion.get('prompt', ''), 200))
+            logger.info("=" * 60)
         
         return result
         
     except Exception as e:
         # Fallback: return original prompt as single suggestion
-        elapsed = (datetime.now() - start_time).total_seconds()
-        logger.error(f"pp_suggestions error after {elapsed:.3f}s: {e}", exc_info=True)
-        logger.info("=" * 60)
+        _log_tool_error("pp_suggestions", start_ns, e)
         return {
             "suggestions": [
                 {
@@ -212,6 +750,45 @@ def pp_suggestions(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dic
 # pp-heal: Prompt Healer
 # ============================================
 
+# mode -> (system prompt, healing type for logs)
+_HEAL_MODES: Dict[str, Tuple[str, str]] = {
+    "anger": (PP_HEAL_ANGER_SYSTEM, "anger translation"),
+    "clarity": (PP_HEAL_CLARITY_SYSTEM, "clarity improvement"),
+}
+_HEAL_AUTO_MODES: Dict[str, Tuple[str, str]] = {
+    "anger": (PP_HEAL_ANGER_SYSTEM, "anger translation (auto)"),
+    "clarity": (PP_HEAL_CLARITY_SYSTEM, "clarity improvement (auto)"),
+}
+_HEAL_DEFAULT_MODE = (PP_HEAL_CLARITY_SYSTEM, "clarity improvement (default)")
+
+
+def _str_list(value: Any) -> List[str]:
+    """Coerce an LLM-provided list field to a list of strings ([] if not a list)."""
+    if not isinstance(value, list):
+        return []
+    if all(type(item) is str for item in value):
+        return value
+    return [item if isinstance(item, str) else json.dumps(item) for item in value]
+
+
+def _validate_heal_result(result: Dict[str, Any], prompt: str) -> None:
+    """
+    Check a parsed pp_heal reply in place, repairing bad fields.
+    
+    A missing, non-string or blank healed_prompt falls back to the original
+    prompt; changes_made becomes a list of strings.
+    
+    Raises:
+        ValueError: If the reply is not a JSON object
+    """
+    if not isinstance(result, dict):
+        raise ValueError(f"Expected a JSON object, got {type(result).__name__}")
+    healed_prompt = result.get("healed_prompt")
+    if not isinstance(healed_prompt, str) or not healed_prompt.strip():
+        result["healed_prompt"] = prompt
+    result["changes_made"] = _str_list(result.get("changes_made"))
+
+
 def pp_heal(
     prompt: str,
     mode: str = "auto",
@@ -228,71 +805,68 @@ def pp_heal(
     Returns:
         Dict with healed_prompt, changes_made, original_intent
     """
-    start_time = datetime.now()
-    logger.info("=" * 60)
-    logger.info(f"pp_heal: Starting prompt healing (mode={mode})")
-    logger.info(f"Original prompt [500 chars]: {truncate_prompt(prompt, 500)}")
+    start_ns = time.perf_counter_ns()
+    # Skip building log records entirely when INFO is filtered
+    log_info = logger.isEnabledFor(logging.INFO)
+    _log_tool_start("pp_heal: Starting prompt healing (mode=%s)", "Original prompt", prompt, mode)
     
     try:
         config = load_config()
-        provider = get_provider_for_tool("pp_heal", config)
         
         # Determine which system prompt to use
-        if mode == "anger":
-            system_prompt = PP_HEAL_ANGER_SYSTEM
-            healing_type = "anger translation"
-        elif mode == "clarity":
-            system_prompt = PP_HEAL_CLARITY_SYSTEM
-            healing_type = "clarity improvement"
-        elif mode == "auto":
-            # Check config and negative tone to decide
-            if config.anger_translator and _has_negative_tone(prompt):
-                system_prompt = PP_HEAL_ANGER_SYSTEM
-                healing_type = "anger translation (auto)"
-            else:
-                system_prompt = PP_HEAL_CLARITY_SYSTEM
-                healing_type = "clarity improvement (auto)"
+        if mode == "auto":
+            negative = _has_negative_tone(prompt)
+            if (
+                not negative
+                and len(prompt.strip()) < config.heal_skip_max_len
+            ):
+                # Short, calm prompt: not worth an LLM round-trip
+                logger.info(
+                    "pp_heal skipped: %d chars < HEAL_SKIP_MAX_LEN=%d, no negative tone",
+                    len(prompt.strip()), config.heal_skip_max_len
+                )
+                logger.info("=" * 60)
+                return {"healed_prompt": prompt, "changes_made": [], "skipped": True}
+            
+            # Check config and negative tone to decide. The tone check is a
+            # local regex (~10us), so exactly one heal variant is requested;
+            # racing both would double token cost without saving latency
+            auto_mode = "anger" if config.anger_translator and negative else "clarity"
+            system_prompt, healing_type = _HEAL_AUTO_MODES[auto_mode]
         else:
-            # Default to clarity for unknown modes
-            system_prompt = PP_HEAL_CLARITY_SYSTEM
-            healing_type = "clarity improvement (default)"
-        
-        logger.info(f"Healing type: {healing_type}")
+            # Unknown modes default to clarity
+            system_prompt, healing_type = _HEAL_MODES.get(mode, _HEAL_DEFAULT_MODE)
         
-        # Use paired template + appropriate system prompt
-        user_prompt = format_heal_prompt(prompt, context or {})
+        if log_info:
+            logger.info("Healing type: %s", healing_type)
         
-        # Call LLM with paired prompts
-        llm_start = datetime.now()
-        response = provider.complete(user_prompt, system_prompt)
-        llm_elapsed = (datetime.now() - llm_start).total_seconds()
-        logger.info(f"LLM call completed in {llm_elapsed:.3f}s")
+        result = _run_tool_llm(
+            "pp_heal", config, system_prompt, format_heal_prompt, prompt, context
+        )
         
-        # Extract and parse JSON (handle markdown code blocks)
-        clean_json = extract_json_from_response(response["content"])
-        result = json.loads(clean_json)
-        
-        # Ensure required fields exist
-        result.setdefault("healed_prompt", prompt)
-        result.setdefault("changes_made", [])
+        # Ensure required fields exist with the expected types
+        _validate_heal_result(result, prompt)
         
         # Log results
-        elapsed = (datetime.now() - start_time).total_seconds()
-        healed_prompt = result['healed_prompt']
-        changes_made = result['changes_made']
-        
-        logger.info(f"pp_heal completed in {elapsed:.3f}s")
-        logger.info(f"Healed prompt [500 chars]: {truncate_prompt(healed_prompt, 500)}")
-        logger.info(f"Changes made ({len(changes_made)}): {', '.join(changes_made) if changes_made else 'none'}")
-        logger.info("=" * 60)
+        if log_info:
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+            healed_prompt = result['healed_prompt']
+            changes_made = result['changes_made']
+            
+            # One record instead of three: fewer handler dispatches and writes
+            logger.info(
+                "pp_heal completed in %.3fs | Changes made (%d): %s\n"
+                "Healed prompt [500 chars]: %s",
+                elapsed, len(changes_made), _Joined(changes_made) if changes_made else "none",
+                _Truncated(healed_prompt, 500)
+            )
+            logger.info("=" * 60)
         
         return result
         
     except Exception as e:
         # Fallback: return original prompt unchanged
-        elapsed = (datetime.now() - start_time).total_seconds()
-        logger.error(f"pp_heal error after {elapsed:.3f}s: {e}", exc_info=True)
-        logger.info("=" * 60)
+        _log_tool_error("pp_heal", start_ns, e)
         return {
             "healed_prompt": prompt,
             "changes_made": [],
@@ -300,6 +874,42 @@ def pp_heal(
         }
 
 
+NEGATIVE_WORDS = (
+    "stupid", "dumb", "idiotic", "garbage", "trash", "terrible", "horrible", "awful",
+    "broken", "useless", "crap", "sucks", "hate", "ridiculous", "insane", "moronic",
+)
+
+
+def _word_alternation(words) -> str:
+    """
+    Build a whole-word regex for `words`, factored by first letter.
+    
+    A lookahead on the set of first letters rejects most word starts
+    before any branch is tried, and grouping by first letter means at most
+    one group's branches run, e.g. h(?:orrible|ate).
+    """
+    groups: Dict[str, list] = {}
+    for word in words:
+        groups.setdefault(word[0], []).append(re.escape(word[1:]))
+    branches = "|".join(f"{first}(?:{'|'.join(rest)})" for first, rest in sorted(groups.items()))
+    return rf"\b(?=[{''.join(sorted(groups))}])(?:{branches})\b"
+
+
+# Negative words as one compiled alternation: a single pass over the prompt,
+# and word boundaries keep e.g. "unbroken" or "whatever" from matching
+_NEGATIVE_TONE_RE = re.compile(_word_alternation(NEGATIVE_WORDS), re.IGNORECASE)
+
+# ASCII prompts (the common case) are lowercased with bytes.translate and
+# scanned by a case-sensitive bytes pattern, which is ~2.5x faster than
+# the case-insensitive str pattern. Non-ASCII prompts use the str pattern
+# so Unicode word boundaries are respected.
+_NEGATIVE_TONE_BYTES_RE = re.compile(_word_alternation(NEGATIVE_WORDS).encode("ascii"))
+_ASCII_LOWER = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    b"abcdefghijklmnopqrstuvwxyz"
+)
+
+
 def _has_negative_tone(prompt: str) -> bool:
     """
     Quick heuristic check for negative language.
@@ -310,19 +920,33 @@ def _has_negative_tone(prompt: str) -> bool:
     Returns:
         True if negative words detected, False otherwise
     """
-    negative_words = [
-        "stupid", "dumb", "idiotic", "garbage", "trash", "terrible",
-        "horrible", "awful", "broken", "useless", "crap", "sucks",
-        "hate", "ridiculous", "insane", "moronic"
-    ]
-    prompt_lower = prompt.lower()
-    return any(word in prompt_lower for word in negative_words)
+    if prompt.isascii():
+        lowered = prompt.encode("ascii").translate(_ASCII_LOWER)
+        return _NEGATIVE_TONE_BYTES_RE.search(lowered) is not None
+    return _NEGATIVE_TONE_RE.search(prompt) is not None
 
 
 # ============================================
 # pp-discuss: Clarifying Questions
 # ============================================
 
+def _validate_discuss_result(result: Dict[str, Any]) -> None:
+    """
+    Check a parsed pp_discuss reply in place, repairing bad fields.
+    
+    questions becomes a list of strings and context a string.
+    
+    Raises:
+        ValueError: If the reply is not a JSON object
+    """
+    if not isinstance(result, dict):
+        raise ValueError(f"Expected a JSON object, got {type(result).__name__}")
+    result["questions"] = _str_list(result.get("questions"))
+    context = result.get("context")
+    if not isinstance(context, str):
+        result["context"] = "" if context is None else str(context)
+
+
 def pp_discuss(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Generate clarifying questions for unclear prompts.
@@ -334,48 +958,35 @@ def pp_discuss(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict[st
     Returns:
         Dict with questions array and context
     """
-    start_time = datetime.now()
-    logger.info("=" * 60)
-    logger.info("pp_discuss: Generating clarifying questions")
-    logger.info(f"Unclear prompt [500 chars]: {truncate_prompt(prompt, 500)}")
+    start_ns = time.perf_counter_ns()
+    # Skip building log records entirely when INFO is filtered
+    log_info = logger.isEnabledFor(logging.INFO)
+    _log_tool_start("pp_discuss: Generating clarifying questions", "Unclear prompt", prompt)
     
     try:
-        config = load_config()
-        provider = get_provider_for_tool("pp_discuss", config)
-        
-        # Use paired template + system prompt
-        user_prompt = format_discuss_prompt(prompt, context or {})
-        
-        # Call LLM with paired prompts
-        llm_start = datetime.now()
-        response = provider.complete(user_prompt, PP_DISCUSS_SYSTEM)
-        llm_elapsed = (datetime.now() - llm_start).total_seconds()
-        logger.info(f"LLM call completed in {llm_elapsed:.3f}s")
+        result = _run_tool_llm(
+            "pp_discuss", load_config(), PP_DISCUSS_SYSTEM,
+            format_discuss_prompt, prompt, context
+        )
         
-        # Extract and parse JSON (handle markdown code blocks)
-        clean_json = extract_json_from_response(response["content"])
-        result = json.loads(clean_json)
-        
-        # Ensure required fields exist
-        result.setdefault("questions", [])
-        result.setdefault("context", "")
+        # Ensure required fields exist with the expected types
+        _validate_discuss_result(result)
         
         # Log results
-        elapsed = (datetime.now() - start_time).total_seconds()
-        questions = result['questions']
-        logger.info(f"pp_discuss completed in {elapsed:.3f}s")
-        logger.info(f"Generated {len(questions)} question(s)")
-        for i, question in enumerate(questions, 1):
-            logger.info(f"Question {i}: {question}")
-        logger.info("=" * 60)
+        if log_info:
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+            questions = result['questions']
+            logger.info("pp_discuss completed in %.3fs", elapsed)
+            logger.info("Generated %d question(s)", len(questions))
+            for i, question in enumerate(questions, 1):
+                logger.info("Question %d: %s", i, question)
+            logger.info("=" * 60)
         
         return result
         
     except Exception as e:
         # Fallback: return generic clarifying questions
-        elapsed = (datetime.now() - start_time).total_seconds()
-        logger.error(f"pp_discuss error after {elapsed:.3f}s: {e}", exc_info=True)
-        logger.info("=" * 60)
+        _log_tool_error("pp_discuss", start_ns, e)
         return {
             "questions": [
                 "What specific changes would you like to make?",
@@ -387,6 +998,114 @@ def pp_discuss(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict[st
         }
 
 
+# ============================================
+# Combined tools (concurrent LLM calls)
+# ============================================
+
+_speculative_pool: Optional[ThreadPoolExecutor] = None
+_speculative_pool_lock = threading.Lock()
+
+
+def _get_speculative_pool() -> ThreadPoolExecutor:
+    """Shared worker threads for speculative and background work (built on first use)."""
+    global _speculative_pool
+    if _speculative_pool is None:
+        with _speculative_pool_lock:
+            if _speculative_pool is None:
+                _speculative_pool = ThreadPoolExecutor(
+                    max_workers=4,
+                    thread_name_prefix="pp-speculative"
+                )
+    return _speculative_pool
+
+
+def preconnect_providers() -> None:
+    """
+    Build each tool's provider and warm its API connection, in the background.
+    
+    Called at startup so the first tool call doesn't also pay for the SDK
+    import and the TLS handshake. Opt-in (PRECONNECT=true), since it sends
+    a request to every configured provider host before any tool is used.
+    Failures are logged at DEBUG; the tool call will report them.
+    """
+    try:
+        config = load_config()
+    except Exception as e:
+        logger.debug("Skipping preconnect: %s", e)
+        return
+    if not config.preconnect:
+        return
+    
+    def warm():
+        warmed = set()
+        for tool in TOOLS:
+            try:
+                provider = get_provider_for_tool(tool, config)
+            except Exception as e:
+                logger.debug("Skipping preconnect for %s: %s", tool, e)
+                continue
+            if id(provider) not in warmed:
+                warmed.add(id(provider))
+                provider.preconnect()
+    
+    _get_speculative_pool().submit(warm)
+
+
+def pp_guard_with_heal(
+    prompt: str,
+    context: Optional[Dict[str, Any]] = None,
+    mode: str = "auto"
+) -> Dict[str, Any]:
+    """
+    Evaluate a prompt while healing it in parallel.
+    
+    pp_heal starts alongside pp_guard, so a verdict other than "proceed"
+    has its healed prompt ready after about one LLM round-trip instead of
+    two. On "proceed" the speculative heal is discarded (one extra call).
+    
+    Args:
+        prompt: The user's prompt to evaluate
+        context: Optional context
+        mode: Healing mode for pp_heal ("clarity", "anger", "auto")
+        
+    Returns:
+        Dict with "guard" (pp_guard result) and "heal" (pp_heal result, or
+        None when the verdict is "proceed")
+    """
+    heal_future = _get_speculative_pool().submit(pp_heal, prompt, mode, context)
+    guard = pp_guard(prompt, context)
+    
+    if guard.get("verdict") == "proceed":
+        # Not needed; cancel() only helps if it hasn't started yet
+        heal_future.cancel()
+        logger.info("Discarded speculative pp_heal (verdict: proceed)")
+        return {"guard": guard, "heal": None}
+    
+    # pp_heal never raises (it falls back to the original prompt)
+    return {"guard": guard, "heal": heal_future.result()}
+
+
+def pp_analyze(prompt: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Evaluate a prompt and generate alternatives concurrently.
+    
+    Both requests share the pooled HTTP client, so they reuse one
+    connection (multiplexed over HTTP/2 when available) and the call takes
+    about as long as the slower of the two.
+    
+    Args:
+        prompt: The user's prompt to analyze
+        context: Optional context
+        
+    Returns:
+        Dict with "guard" (pp_guard result) and "suggestions" (pp_suggestions result)
+    """
+    suggestions_future = _get_speculative_pool().submit(pp_suggestions, prompt, context)
+    guard = pp_guard(prompt, context)
+    # pp_suggestions never raises (it returns fallback suggestions)
+    return {"guard": guard, "suggestions": suggestions_future.result()}
+
+
 # ============================================
 # pp-proceed: User Override
 # ============================================
@@ -0,0 +1,38 @@
+"""Shared fixtures for the mcp_server tool tests."""
+import threading
+
+import pytest
+
+from mcp_server import tools
+from mcp_server.config import Config
+
+
+class FakeProvider:
+    """ModelProvider stand-in that counts calls and can hold replies back."""
+
+    model = "fake-model"
+
+    def __init__(self, reply='{"verdict": "proceed"}', error=None):
+        self.reply = reply
+        self.error = error
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+        self._lock = threading.Lock()
+
+    def stream(self, prompt, system=""):
+        with self._lock:
+            self.calls += 1
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        yield self.reply
+
+
+@pytest.fixture
+def config(monkeypatch):
+    config = Config(anthropic_api_key="test-key", semantic_cache=False)
+    monkeypatch.setattr(tools, "load_config", lambda: config)
+    tools.clear_response_cache()
+    yield config
+    tools.clear_response_cache()
@@ -0,0 +1,130 @@
+"""Tests for the cached Config and reloading it from .env / the environment."""
+import os
+import types
+
+import pytest
+
+from mcp_server import config as config_module
+from mcp_server.config import get_provider_for_tool, load_config, reload_config
+
+CONFIG_VARS = (
+    "ANTHROPIC_API_KEY", "OPENAI_API_KEY", "GROQ_API_KEY",
+    "DEFAULT_PROVIDER", "DEFAULT_MODEL", "FAST_PATH",
+)
+
+
+@pytest.fixture
+def clock():
+    """Fake monotonic clock for the .env check interval."""
+    return types.SimpleNamespace(now=0.0)
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch, clock):
+    """Point the config at a temporary .env with fresh module state."""
+    for name in CONFIG_VARS:
+        monkeypatch.delenv(name, raising=False)
+    path = tmp_path / ".env"
+    monkeypatch.setattr(config_module, "ENV_FILE", path)
+    monkeypatch.setattr(config_module, "time", types.SimpleNamespace(monotonic=lambda: clock.now))
+    monkeypatch.setattr(config_module, "_DOTENV_KEYS", set())
+    monkeypatch.setattr(config_module, "_env_file_mtime", None)
+    monkeypatch.setattr(config_module, "_next_env_check", 0.0)
+    reload_config()
+    yield path
+    for name in config_module._DOTENV_KEYS:
+        os.environ.pop(name, None)
+    reload_config()
+
+
+def test_load_config_is_cached(env_file):
+    env_file.write_text("ANTHROPIC_API_KEY=k1\n")
+    assert load_config() is load_config()
+
+
+def test_reload_config_rereads_env_file_and_environment(env_file, monkeypatch):
+    env_file.write_text("ANTHROPIC_API_KEY=k1\nDEFAULT_MODEL=model-a\n")
+    first = load_config()
+    assert first.default_model == "model-a"
+
+    # Without a reload (and before the next .env check) the cache stays
+    monkeypatch.setenv("FAST_PATH", "true")
+    assert load_config() is first
+
+    reload_config()
+    second = load_config()
+    assert second is not first
+    assert second.fast_path is True
+    assert second.default_model == "model-a"
+
+
+def test_reload_config_drops_cached_providers(env_file):
+    env_file.write_text("ANTHROPIC_API_KEY=k1\n")
+    config = load_config()
+    config_module._TOOL_PROVIDERS[("pp_guard", id(config))] = (config, "cached provider")
+    assert get_provider_for_tool("pp_guard", config) == "cached provider"
+
+    reload_config()
+    assert not config_module._TOOL_PROVIDERS
+
+
+def test_environment_wins_over_env_file(env_file, monkeypatch):
+    monkeypatch.setenv("DEFAULT_MODEL", "from-environment")
+    env_file.write_text("ANTHROPIC_API_KEY=k1\nDEFAULT_MODEL=from-dotenv\n")
+    assert load_config().default_model == "from-environment"
+    assert "DEFAULT_MODEL" not in config_module._DOTENV_KEYS
+
+
+def _rewrite(path, text, bump_ns):
+    """Rewrite .env with a distinct mtime (coarse filesystems may not tick)."""
+    mtime_ns = path.stat().st_mtime_ns + bump_ns
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_env_file_edit_is_picked_up_after_check_interval(env_file, clock):
+    env_file.write_text("ANTHROPIC_API_KEY=k1\nDEFAULT_MODEL=model-a\n")
+    first = load_config()
+    assert first.default_model == "model-a"
+
+    _rewrite(env_file, "ANTHROPIC_API_KEY=k1\nDEFAULT_MODEL=model-b\n", bump_ns=1_000_000_000)
+    # Not re-checked until ENV_CHECK_INTERVAL_SECS has passed
+    clock.now = config_module.ENV_CHECK_INTERVAL_SECS / 2
+    assert load_config() is first
+
+    clock.now = config_module.ENV_CHECK_INTERVAL_SECS
+    second = load_config()
+    assert second.default_model == "model-b"
+    assert os.environ["DEFAULT_MODEL"] == "model-b"
+
+
+def test_unchanged_env_file_keeps_cached_config(env_file, clock):
+    env_file.write_text("ANTHROPIC_API_KEY=k1\n")
+    first = load_config()
+    for step in range(1, 4):
+        clock.now = step * config_module.ENV_CHECK_INTERVAL_SECS
+        assert load_config() is first
+
+
+def test_keys_removed_from_env_file_are_dropped(env_file, clock):
+    env_file.write_text("ANTHROPIC_API_KEY=k1\nFAST_PATH=true\n")
+    assert load_config().fast_path is True
+
+    _rewrite(env_file, "ANTHROPIC_API_KEY=k1\n", bump_ns=1_000_000_000)
+    clock.now = config_module.ENV_CHECK_INTERVAL_SECS
+    assert load_config().fast_path is False
+    assert "FAST_PATH" not in os.environ
+
+
+def test_env_file_created_and_deleted(env_file, clock, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "from-environment")
+    assert load_config().default_model == "claude-3-5-sonnet-20241022"
+
+    env_file.write_text("DEFAULT_MODEL=model-a\n")
+    clock.now = config_module.ENV_CHECK_INTERVAL_SECS
+    assert load_config().default_model == "model-a"
+
+    env_file.unlink()
+    clock.now = 2 * config_module.ENV_CHECK_INTERVAL_SECS
+    assert load_config().default_model == "claude-3-5-sonnet-20241022"
+    assert "DEFAULT_MODEL" not in os.environ
@@ -0,0 +1,161 @@
+"""Tests for the beforeSubmitPrompt hook: worker client, logging and prompt triage."""
+import importlib.util
+import itertools
+import json
+import re
+import sys
+import threading
+import time
+
+import pytest
+
+import before_submit_prompt as hook
+import pp_daemon
+
+
+def test_call_daemon_gives_up_within_budget(monkeypatch, tmp_path):
+    def refuse(*args, **kwargs):
+        raise ConnectionRefusedError
+
+    spawned = []
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    monkeypatch.setattr(pp_daemon, "request", refuse)
+    monkeypatch.setattr(hook, "_spawn_daemon_once", lambda *args: spawned.append(args))
+
+    start = time.monotonic()
+    with pytest.raises(ConnectionRefusedError):
+        hook._call_daemon({"op": "ping"}, deadline=start + 30)
+    assert time.monotonic() - start < hook.DAEMON_CONNECT_BUDGET_SECS + 0.2
+    assert spawned
+
+
+def test_background_call_logs_after_final_flush(monkeypatch, tmp_path):
+    log_file = tmp_path / "hook.log"
+    monkeypatch.setattr(hook, "LOG_FILE", log_file)
+    monkeypatch.setattr(hook, "_BACKGROUND", [])
+    release = threading.Event()
+
+    def slow_heal():
+        release.wait(5)
+        hook._log("INFO", "speculative heal finished")
+
+    future = hook._submit(slow_heal)
+    hook._log("INFO", "main thread done")
+    hook._flush_log()
+    release.set()
+    hook._join_background(5)
+
+    assert future.done()
+    lines = log_file.read_text().splitlines()
+    assert [line.split("] ", 1)[1] for line in lines] == ["main thread done", "speculative heal finished"]
+
+
+# The two searches _FAST_PATH_RE replaced; the single pass must agree with them
+_OLD_ACTION_VERB_RE = re.compile(
+    r"\b(add|fix|refactor|explain|write|run|test|implement|create|update|"
+    r"remove|delete|rename|move|debug|optimize|document|review|convert|migrate)\b",
+    re.IGNORECASE
+)
+_OLD_ANGER_RE = re.compile(
+    r"\b(stupid|dumb|idiotic|garbage|trash|terrible|horrible|awful|useless|"
+    r"crap|sucks|hate|ridiculous|insane|moronic|wtf|damn|shit|fuck\w*)\b",
+    re.IGNORECASE
+)
+
+
+def _old_fast_proceed(prompt):
+    return (
+        hook.FAST_PROCEED_MIN_LEN <= len(prompt) <= hook.FAST_PROCEED_MAX_LEN
+        and _OLD_ACTION_VERB_RE.search(prompt) is not None
+        and _OLD_ANGER_RE.search(prompt) is None
+    )
+
+
+@pytest.mark.parametrize("prompt, expected", [
+    ("run the tests for the auth module", True),
+    ("Refactor the parser into smaller functions", True),
+    ("fix this stupid login bug right now please", False),
+    ("this garbage code should be refactored", False),
+    ("Fix the FUCKING build, it fails on CI again", False),
+    ("the testing harness looks slow to me today", False),  # "testing" is not "test"
+    ("what does this module do in the codebase?", False),  # no action verb
+    ("fix it", False),  # too short
+    ("add " + "x" * hook.FAST_PROCEED_MAX_LEN, False),  # too long
+])
+def test_fast_proceed(prompt, expected):
+    assert hook._fast_proceed(prompt) is expected
+    assert _old_fast_proceed(prompt) is expected
+
+
+def test_fast_proceed_matches_separate_searches():
+    words = ["please", "fix", "Add", "the", "stupid", "tests", "debugging", "WTF", "fuckin", "module", "run"]
+    for combo in itertools.product(words, repeat=4):
+        prompt = "could you " + " ".join(combo) + " now"
+        assert hook._fast_proceed(prompt) == _old_fast_proceed(prompt), prompt
+
+
+def _load_hook_without(monkeypatch, *blocked):
+    """Import a fresh copy of the hook with the given optional modules missing."""
+    for name in blocked:
+        monkeypatch.setitem(sys.modules, name, None)
+    spec = importlib.util.spec_from_file_location(f"_hook_without_{'_'.join(blocked)}", hook.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(params=["simdjson", "ijson", "json"])
+def extract_hook(request, monkeypatch):
+    """The hook module using each _extract_prompt backend in turn."""
+    if request.param == "simdjson":
+        pytest.importorskip("simdjson")
+        return _load_hook_without(monkeypatch)
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+        return _load_hook_without(monkeypatch, "simdjson")
+    return _load_hook_without(monkeypatch, "simdjson", "ijson")
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (b'{"prompt": "fix the bug"}', "fix the bug"),
+    (b'{"conversation_id": "c1", "attachments": [{"prompt": "nested", "data": "x"}], "prompt": "top"}', "top"),
+    (b'{"meta": {"prompt": "nested"}, "prompt": "line\\nnext \\"q\\" \\u00e9 \\ud83d\\ude00"}', 'line\nnext "q" é \U0001F600'),
+    (b'{"prompt": ""}', ""),
+    (b'{"hook_event_name": "beforeSubmitPrompt"}', ""),
+    (b'["prompt", "not an object"]', ""),
+])
+def test_extract_prompt(extract_hook, raw, expected):
+    assert extract_hook._extract_prompt(raw) == expected
+
+
+def test_extract_prompt_non_string_is_not_a_prompt(extract_hook):
+    # main() treats any non-str result as an empty prompt
+    result = extract_hook._extract_prompt(b'{"prompt": {"text": "hi"}}')
+    assert not isinstance(result, str) or result == ""
+
+
+@pytest.mark.parametrize("raw", [b'{"prompt": ', b'{"prompt" "x"}', b'{"prompt": "unterminated'])
+def test_extract_prompt_invalid_json(extract_hook, raw):
+    with pytest.raises(extract_hook._EVENT_JSON_ERRORS):
+        extract_hook._extract_prompt(raw)
+
+
+@pytest.mark.parametrize("response", [
+    {"continue": True, "prompt": "fix the bug"},
+    {"continue": True, "prompt": 'quotes " and \\ and\nnewlines, unicode é ✨ \U0001F600'},
+    {"continue": True, "prompt": ""},
+    {"continue": True},
+    {"continue": False, "userMessage": "blocked"},
+    {"continue": True, "prompt": "p", "userMessage": "healed"},
+    {"prompt": "p", "continue": 1},
+])
+def test_encode_response_matches_full_serialization(response):
+    encoded = hook._encode_response(response)
+    assert encoded == hook.json_bytes(response)
+    assert json.loads(encoded) == response
+
+
+def test_encode_response_reuses_precomputed_bytes():
+    assert hook._encode_response(hook.EMPTY_PROMPT_RESPONSE) is hook._EMPTY_BLOCK
+    assert json.loads(hook._EMPTY_BLOCK) == hook.EMPTY_PROMPT_RESPONSE
+    assert json.loads(hook._OK_CONT) == {"continue": True}
@@ -0,0 +1,55 @@
+"""Tests for sharing one LLM call between identical in-flight requests."""
+import threading
+import time
+
+from conftest import FakeProvider
+from mcp_server import tools
+
+
+def _run_concurrently(provider, count):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(tools._complete_json("pp_guard", provider, "system", "prompt"))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    provider.release.clear()
+    for thread in threads:
+        thread.start()
+    # Let every thread reach the provider or the in-flight future
+    deadline = time.monotonic() + 5
+    while provider.calls == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    provider.release.set()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+def test_concurrent_identical_requests_share_one_call(config):
+    provider = FakeProvider()
+    results, errors = _run_concurrently(provider, 8)
+    assert not errors
+    assert provider.calls == 1
+    assert results == [{"verdict": "proceed"}] * 8
+    # Each caller gets a private copy
+    assert len({id(r) for r in results}) == 8
+    assert not tools._INFLIGHT
+
+
+def test_shared_failure_reaches_every_caller_and_is_not_cached(config):
+    provider = FakeProvider(error=RuntimeError("provider down"))
+    results, errors = _run_concurrently(provider, 4)
+    assert not results
+    assert provider.calls == 1
+    assert len(errors) == 4
+    assert all(str(e) == "provider down" for e in errors)
+    assert not tools._INFLIGHT
+
+    provider.error = None
+    assert tools._complete_json("pp_guard", provider, "system", "prompt") == {"verdict": "proceed"}
+    assert provider.calls == 2
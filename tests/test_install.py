@@ -0,0 +1,146 @@
+"""Tests for hooks/install.py and hooks/uninstall.py against a temporary home."""
+import json
+
+import pytest
+
+import install
+import uninstall
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    """A project with run.sh and a venv, and an empty ~/.cursor."""
+    project = tmp_path / "project"
+    (project / "hooks").mkdir(parents=True)
+    (project / "hooks" / "run.sh").write_text("#!/bin/sh\n")
+    (project / ".venv" / "bin").mkdir(parents=True)
+    (project / ".venv" / "bin" / "python").write_text("")
+    config_path = tmp_path / "home" / ".cursor" / "hooks.json"
+
+    for module in (install, uninstall):
+        monkeypatch.setattr(module, "get_project_root", lambda: project)
+        monkeypatch.setattr(module, "get_hooks_config_path", lambda: config_path)
+    monkeypatch.setattr("_common.get_hooks_config_path", lambda: config_path)
+    return project, config_path
+
+
+def _backups(config_path):
+    return sorted(config_path.parent.glob("hooks.backup.*"))
+
+
+def _write_config(config_path, hooks):
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    config_path.write_text(json.dumps({"version": 1, "hooks": {"beforeSubmitPrompt": hooks}}))
+
+
+def test_install_backs_up_existing_config(env):
+    project, config_path = env
+    _write_config(config_path, [{"command": "/other/hook.sh"}])
+
+    assert install.install_hook() == 0
+    assert len(_backups(config_path)) == 1
+    hooks = json.loads(config_path.read_text())["hooks"]["beforeSubmitPrompt"]
+    assert hooks == [{"command": "/other/hook.sh"}, {"command": str(project / "hooks" / "run.sh")}]
+
+
+def test_install_no_backup(env):
+    project, config_path = env
+    _write_config(config_path, [{"command": "/other/hook.sh"}])
+
+    assert install.install_hook(backup=False) == 0
+    assert _backups(config_path) == []
+    assert len(json.loads(config_path.read_text())["hooks"]["beforeSubmitPrompt"]) == 2
+
+
+def test_uninstall_no_backup(env):
+    project, config_path = env
+    _write_config(config_path, [{"command": "/other/hook.sh"}, {"command": str(project / "hooks" / "run.sh")}])
+
+    assert uninstall.uninstall_hook(backup=False) == 0
+    assert _backups(config_path) == []
+    assert json.loads(config_path.read_text())["hooks"]["beforeSubmitPrompt"] == [{"command": "/other/hook.sh"}]
+
+
+def test_uninstall_backs_up_and_deletes_empty_config(env):
+    project, config_path = env
+    _write_config(config_path, [{"command": str(project / "hooks" / "run.sh")}])
+
+    assert uninstall.uninstall_hook() == 0
+    assert not config_path.exists()
+    assert len(_backups(config_path)) == 1
+
+
+@pytest.mark.parametrize("module, entry", [(install, install.main), (uninstall, uninstall.main)])
+def test_no_backup_flag(env, monkeypatch, module, entry):
+    calls = []
+    target = "install_hook" if module is install else "uninstall_hook"
+    monkeypatch.setattr(module, target, lambda **kwargs: calls.append(kwargs) or 0)
+
+    for argv, backup in ((["prog"], True), (["prog", "--no-backup"], False)):
+        monkeypatch.setattr("sys.argv", argv)
+        with pytest.raises(SystemExit) as exit_info:
+            entry()
+        assert exit_info.value.code == 0
+        assert calls.pop()["backup"] is backup
+
+
+def _scan_for_hook(config, project_root):
+    """The plain substring scan the command index short-circuits."""
+    hooks_list = config.get("hooks", {}).get("beforeSubmitPrompt", [])
+    for idx, hook in enumerate(hooks_list):
+        if install.hook_matches(hook, str(project_root)):
+            return idx, hook
+    return None, None
+
+
+def test_find_hook_by_command(tmp_path):
+    project = tmp_path / "project"
+    command = str(project / "hooks" / "run.sh")
+    hooks = [{"command": "/other/hook.sh"}, {"command": command}, {"command": command, "dup": True}]
+    config = {"hooks": {"beforeSubmitPrompt": hooks}}
+    assert install.find_prompt_paladin_hook(config, project) == (1, hooks[1])
+
+
+def test_find_hook_falls_back_to_path_scan(tmp_path):
+    project = tmp_path / "project"
+    old_hook = {"command": "python", "args": [str(project / "hooks" / "before_submit_prompt.py")]}
+    config = {"hooks": {"beforeSubmitPrompt": [{"command": None}, {"command": "/other.sh"}, old_hook]}}
+    assert install.find_prompt_paladin_hook(config, project) == (2, old_hook)
+
+
+@pytest.mark.parametrize("hooks", [
+    [],
+    [{"command": "/other.sh"}],
+    [{"args": ["x"]}, {"command": 42}],
+    [{"command": "{project}/hooks/run.sh"}],
+    [{"command": "python {project}/hooks/old.py"}, {"command": "{project}/hooks/run.sh"}],
+    [{"command": "{project}/hooks/run.sh"}, {"command": "python {project}/hooks/old.py"}],
+])
+def test_find_hook_matches_plain_scan(tmp_path, hooks):
+    # The exact-command lookup may pick a later entry than the scan would,
+    # but only when an earlier one also points into the project
+    project = tmp_path / "project"
+    hooks = [
+        {key: value.format(project=project) if isinstance(value, str) else value for key, value in hook.items()}
+        for hook in hooks
+    ]
+    config = {"hooks": {"beforeSubmitPrompt": hooks}}
+    found = install.find_prompt_paladin_hook(config, project)
+    scanned = _scan_for_hook(config, project)
+    assert (found[0] is None) == (scanned[0] is None)
+    if found[0] is not None:
+        assert install.hook_matches(found[1], str(project))
+
+
+def test_install_updates_existing_entry_in_place(env):
+    project, config_path = env
+    command = str(project / "hooks" / "run.sh")
+    _write_config(config_path, [{"command": "/other.sh"}, {"command": f"python {project}/hooks/old.py"}])
+
+    assert install.install_hook(backup=False) == 0
+    hooks = json.loads(config_path.read_text())["hooks"]["beforeSubmitPrompt"]
+    assert hooks == [{"command": "/other.sh"}, {"command": command}]
+    # Installing again finds it by command and leaves the file alone
+    before = config_path.read_bytes()
+    assert install.install_hook(backup=False) == 0
+    assert config_path.read_bytes() == before
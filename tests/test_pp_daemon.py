@@ -0,0 +1,146 @@
+"""Tests for the hook worker: socket protocol, dispatch, permissions and peer checks."""
+import os
+import socket
+import struct
+import threading
+
+import pytest
+
+import pp_daemon
+
+
+@pytest.fixture
+def sockets():
+    left, right = socket.socketpair()
+    yield left, right
+    left.close()
+    right.close()
+
+
+def test_round_trip(sockets):
+    left, right = sockets
+    payload = {"op": "guard", "prompt": "fix the bug ✨ in {main}", "nested": [1, None]}
+    pp_daemon.send_message(left, payload)
+    assert pp_daemon.recv_message(right) == payload
+
+
+def test_header_is_big_endian_length(sockets):
+    left, right = sockets
+    pp_daemon.send_message(left, {"op": "ping"})
+    (size,) = struct.unpack(">I", right.recv(4))
+    assert size == len(right.recv(size))
+
+
+def test_messages_larger_than_one_recv(sockets):
+    left, right = sockets
+    payload = {"prompt": "x" * (1 << 20)}
+    sender = threading.Thread(target=pp_daemon.send_message, args=(left, payload))
+    sender.start()
+    assert pp_daemon.recv_message(right) == payload
+    sender.join()
+
+
+def test_back_to_back_messages(sockets):
+    left, right = sockets
+    pp_daemon.send_message(left, {"n": 1})
+    pp_daemon.send_message(left, {"n": 2})
+    assert pp_daemon.recv_message(right) == {"n": 1}
+    assert pp_daemon.recv_message(right) == {"n": 2}
+
+
+@pytest.mark.parametrize("data", [b"", b"\x00\x00", struct.pack(">I", 10) + b'{"a"'])
+def test_eof_mid_message_raises(sockets, data):
+    left, right = sockets
+    left.sendall(data)
+    left.shutdown(socket.SHUT_WR)
+    with pytest.raises(ConnectionError):
+        pp_daemon.recv_message(right)
+
+
+def test_dispatch_ping():
+    assert pp_daemon.dispatch({"op": "ping"}, {})["ok"] is True
+
+
+def test_dispatch_unknown_op():
+    with pytest.raises(ValueError):
+        pp_daemon.dispatch({"op": "nope"}, {})
+
+
+def test_dispatch_routes_to_tools():
+    tools = {
+        "pp_guard": lambda prompt: {"tool": "guard", "prompt": prompt},
+        "pp_heal": lambda prompt, mode: {"tool": "heal", "prompt": prompt, "mode": mode},
+    }
+    assert pp_daemon.dispatch({"op": "guard", "prompt": "p"}, tools) == {"tool": "guard", "prompt": "p"}
+    assert pp_daemon.dispatch({"op": "heal", "prompt": "p"}, tools)["mode"] == "auto"
+    assert pp_daemon.dispatch({"op": "heal", "prompt": "p", "mode": "anger"}, tools)["mode"] == "anger"
+
+
+def test_runtime_dir_is_private(tmp_path):
+    runtime_dir = pp_daemon.get_runtime_dir({"XDG_RUNTIME_DIR": str(tmp_path)})
+    assert runtime_dir == tmp_path / "prompt-paladin"
+    assert runtime_dir.stat().st_mode & 0o777 == 0o700
+    assert pp_daemon.get_socket_path({"XDG_RUNTIME_DIR": str(tmp_path)}).parent == runtime_dir
+
+
+def test_runtime_dir_rejects_open_permissions(tmp_path):
+    (tmp_path / "prompt-paladin").mkdir(mode=0o777)
+    (tmp_path / "prompt-paladin").chmod(0o777)
+    with pytest.raises(PermissionError):
+        pp_daemon.get_runtime_dir({"XDG_RUNTIME_DIR": str(tmp_path)})
+
+
+def test_runtime_dir_rejects_symlink(tmp_path):
+    target = tmp_path / "elsewhere"
+    target.mkdir(mode=0o700)
+    (tmp_path / "prompt-paladin").symlink_to(target)
+    with pytest.raises(PermissionError):
+        pp_daemon.get_runtime_dir({"XDG_RUNTIME_DIR": str(tmp_path)})
+
+
+def test_socket_lock_does_not_follow_symlinks(tmp_path):
+    socket_path = tmp_path / "w.sock"
+    victim = tmp_path / "victim"
+    victim.write_text("keep")
+    (tmp_path / "w.sock.lock").symlink_to(victim)
+    with pytest.raises(OSError):
+        with pp_daemon._socket_lock(socket_path):
+            pass
+    assert victim.read_text() == "keep"
+
+
+def test_peer_uid(sockets):
+    left, _ = sockets
+    assert pp_daemon.peer_uid(left) == os.getuid()
+
+
+@pytest.fixture
+def worker(tmp_path):
+    socket_path = tmp_path / "w.sock"
+    server = pp_daemon.PaladinDaemon(socket_path, {"pp_guard": lambda prompt: {"prompt": prompt}})
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
+
+
+def test_request_round_trip(worker):
+    assert pp_daemon.request(worker, {"op": "guard", "prompt": "p"}, timeout=5) == {"prompt": "p"}
+
+
+def test_request_refuses_foreign_worker(worker, monkeypatch):
+    monkeypatch.setattr(pp_daemon, "peer_uid", lambda sock: os.getuid() + 1)
+    with pytest.raises(PermissionError):
+        pp_daemon.request(worker, {"op": "ping"}, timeout=5)
+
+
+def test_worker_drops_foreign_client(worker, monkeypatch):
+    real_peer_uid = pp_daemon.peer_uid
+    # Server side sees a foreign uid; the client's own check still passes
+    monkeypatch.setattr(
+        pp_daemon, "peer_uid",
+        lambda sock: os.getuid() + 1 if threading.current_thread().name != "MainThread" else real_peer_uid(sock),
+    )
+    with pytest.raises(ConnectionError):
+        pp_daemon.request(worker, {"op": "ping"}, timeout=5)
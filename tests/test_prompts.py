@@ -0,0 +1,64 @@
+"""Tests that the shared prompt builder reproduces the original per-tool templates."""
+import itertools
+
+import pytest
+
+from mcp_server import prompts
+
+
+def _original_history(history):
+    if isinstance(history, list):
+        return "\n".join(f"- {item}" for item in history)
+    elif isinstance(history, str):
+        return history
+    else:
+        return str(history)
+
+
+def _original_prompt(header, label, footer, user_prompt, context):
+    """The parts/"\\n".join builder each format_*_prompt used to repeat."""
+    parts = [f"{header}\n"]
+    if context.get("conversation_history"):
+        parts.append(f"CONVERSATION CONTEXT:\n{_original_history(context['conversation_history'])}\n")
+    parts.append(f"{label}:\n{user_prompt}\n")
+    if context.get("active_files"):
+        parts.append(f"ACTIVE FILES: {', '.join(context['active_files'])}\n")
+    if context.get("selected_code"):
+        parts.append(f"SELECTED CODE:\n{context['selected_code']}\n")
+    parts.append(f"\n{footer}")
+    return "\n".join(parts)
+
+
+FORMATTERS = [
+    (prompts.format_guard_prompt, "Evaluate this user prompt for quality:",
+     "USER PROMPT TO EVALUATE", "Provide your evaluation as JSON."),
+    (prompts.format_suggestions_prompt, "Generate improved alternatives for this user prompt:",
+     "ORIGINAL PROMPT", "Provide 2-3 improved alternatives as JSON."),
+    (prompts.format_heal_prompt, "Heal this user prompt:",
+     "PROMPT TO HEAL", "Provide the healed prompt as JSON."),
+    (prompts.format_discuss_prompt, "This user prompt needs clarification:",
+     "UNCLEAR PROMPT", "Generate 2-4 specific clarifying questions as JSON."),
+]
+
+HISTORIES = [None, [], ["asked about auth", "got a stack trace"], "summary: refactoring", ("a", "b")]
+FILES = [None, [], ["auth.py"], ["auth.py", "db/models.py"]]
+CODE = [None, "", "def f():\n    return {x}"]
+
+
+def _contexts():
+    for history, files, code in itertools.product(HISTORIES, FILES, CODE):
+        context = {}
+        if history is not None:
+            context["conversation_history"] = history
+        if files is not None:
+            context["active_files"] = files
+        if code is not None:
+            context["selected_code"] = code
+        yield context
+
+
+@pytest.mark.parametrize("formatter, header, label, footer", FORMATTERS)
+@pytest.mark.parametrize("user_prompt", ["fix the bug", "", "multi\nline {prompt} with %s"])
+def test_format_matches_original_template(formatter, header, label, footer, user_prompt):
+    for context in _contexts():
+        assert formatter(user_prompt, context) == _original_prompt(header, label, footer, user_prompt, context), context
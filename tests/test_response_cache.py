@@ -0,0 +1,113 @@
+"""Tests for the exact-match response cache."""
+import time
+
+from conftest import FakeProvider
+from mcp_server import tools
+from mcp_server.config import Config
+from mcp_server.tools import ResponseCache
+
+
+def test_key_depends_on_every_component():
+    base = ResponseCache.key("pp_guard", "m", "system", "prompt")
+    assert base == ResponseCache.key("pp_guard", "m", "system", "prompt")
+    assert len(base) == 16
+    assert base != ResponseCache.key("pp_heal", "m", "system", "prompt")
+    assert base != ResponseCache.key("pp_guard", "m2", "system", "prompt")
+    assert base != ResponseCache.key("pp_guard", "m", "system2", "prompt")
+    assert base != ResponseCache.key("pp_guard", "m", "system", "prompt2")
+
+
+def test_evicts_least_recently_used():
+    cache = ResponseCache(maxlen=2)
+    cache.put(b"a", {"v": "a"})
+    cache.put(b"b", {"v": "b"})
+    assert cache.get(b"a") == {"v": "a"}
+    cache.put(b"c", {"v": "c"})
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == {"v": "a"}
+    assert cache.get(b"c") == {"v": "c"}
+
+
+def test_entries_expire_after_ttl():
+    cache = ResponseCache(ttl=0.05)
+    cache.put(b"a", {"v": "a"})
+    assert cache.get(b"a") == {"v": "a"}
+    time.sleep(0.1)
+    assert cache.get(b"a") is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "response_cache.json"
+    cache = ResponseCache(maxlen=2)
+    for name in (b"a", b"b", b"c"):
+        cache.put(name * 16, {"v": name.decode()})
+    cache.save(path)
+    assert oct(path.stat().st_mode & 0o777) == "0o600"
+
+    reloaded = ResponseCache(maxlen=2)
+    reloaded.load(path)
+    assert reloaded.get(b"a" * 16) is None
+    assert reloaded.get(b"b" * 16) == {"v": "b"}
+    assert reloaded.get(b"c" * 16) == {"v": "c"}
+
+
+def test_load_drops_expired_and_ignores_bad_files(tmp_path, monkeypatch):
+    path = tmp_path / "response_cache.json"
+    cache = ResponseCache()
+    cache.put(b"k" * 16, {"v": 1})
+    cache.save(path)
+
+    wall_now = time.time()
+    monkeypatch.setattr(tools.time, "time", lambda: wall_now + 60)
+    fresh = ResponseCache(ttl=120)
+    fresh.load(path)
+    assert fresh.get(b"k" * 16) == {"v": 1}
+    stale = ResponseCache(ttl=30)
+    stale.load(path)
+    assert stale.get(b"k" * 16) is None
+
+    path.write_bytes(b"not json")
+    broken = ResponseCache()
+    broken.load(path)
+    broken.load(tmp_path / "missing.json")
+    assert broken.get(b"k" * 16) is None
+
+
+def test_repeat_request_is_served_from_cache(config):
+    provider = FakeProvider()
+    first = tools._complete_json("pp_guard", provider, "system", "prompt")
+    first["verdict"] = "mutated by caller"
+    second = tools._complete_json("pp_guard", provider, "system", "prompt")
+    assert second == {"verdict": "proceed"}
+    assert provider.calls == 1
+
+
+def test_cache_disabled_calls_provider_every_time(monkeypatch):
+    config = Config(anthropic_api_key="test-key", response_cache=False)
+    monkeypatch.setattr(tools, "load_config", lambda: config)
+    provider = FakeProvider()
+    tools._complete_json("pp_guard", provider, "system", "prompt")
+    tools._complete_json("pp_guard", provider, "system", "prompt")
+    assert provider.calls == 2
+
+
+def test_pp_guard_reuses_result_for_same_prompt_and_context(config, monkeypatch):
+    provider = FakeProvider(reply='{"verdict": "heal", "reason": "vague"}')
+    monkeypatch.setattr(tools, "get_provider_for_tool", lambda tool, config: provider)
+
+    first = tools.pp_guard("fix it")
+    assert tools.pp_guard("fix it") == first
+    assert provider.calls == 1
+
+    tools.pp_guard("fix it", context={"active_files": ["auth.py"]})
+    tools.pp_guard("fix it", context={"active_files": ["db.py"]})
+    assert provider.calls == 3
+    tools.pp_guard("fix it", context={"active_files": ["db.py"]})
+    assert provider.calls == 3
+
+
+def test_ttl_follows_config():
+    config = Config(anthropic_api_key="test-key", response_cache_ttl=5.0)
+    assert tools._get_response_cache(config).ttl == 5.0
+    config = Config(anthropic_api_key="test-key", response_cache_ttl=60.0)
+    assert tools._get_response_cache(config).ttl == 60.0
@@ -0,0 +1,132 @@
+"""Tests for the semantic cache, using a stub encoder instead of a real model."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from conftest import FakeProvider
+from mcp_server import tools
+from mcp_server.config import Config
+from mcp_server.semantic_cache import SemanticCache
+
+
+class StubEncoder:
+    """SentenceTransformer stand-in: fixed vectors per prompt."""
+
+    VECTORS = {
+        "fix the bug": [1.0, 0.0, 0.0],
+        "please fix the bug": [0.99, 0.14, 0.0],
+        "write docs": [0.0, 1.0, 0.0],
+        "delete everything": [0.0, 0.0, 1.0],
+    }
+
+    def encode(self, prompt, normalize_embeddings=False):
+        vec = np.array(self.VECTORS[prompt], dtype=np.float64)
+        return vec / np.linalg.norm(vec) if normalize_embeddings else vec
+
+
+def make_cache(**kwargs):
+    kwargs.setdefault("path", None)
+    cache = SemanticCache(**kwargs)
+    cache._model = StubEncoder()
+    return cache
+
+
+def test_close_rewording_hits():
+    cache = make_cache(threshold=0.95)
+    cache.put(b"scope", cache.encode("fix the bug"), {"verdict": "proceed"})
+    similarity, result = cache.get(b"scope", cache.encode("please fix the bug"))
+    assert similarity > 0.95
+    assert result == {"verdict": "proceed"}
+    assert cache.get(b"scope", cache.encode("write docs")) is None
+
+
+def test_other_scopes_are_masked():
+    cache = make_cache()
+    cache.put(b"guard", cache.encode("fix the bug"), {"verdict": "proceed"})
+    # Identical embedding, different tool/model/context scope
+    assert cache.get(b"other", cache.encode("fix the bug")) is None
+
+
+def test_threshold_applies_on_lookup():
+    cache = make_cache(threshold=0.999)
+    cache.put(b"scope", cache.encode("fix the bug"), {"verdict": "proceed"})
+    assert cache.get(b"scope", cache.encode("please fix the bug")) is None
+    cache.threshold = 0.9
+    assert cache.get(b"scope", cache.encode("please fix the bug")) is not None
+
+
+def test_evicts_least_recently_used():
+    cache = make_cache(maxlen=2)
+    cache.put(b"s", cache.encode("fix the bug"), {"v": "bug"})
+    cache.put(b"s", cache.encode("write docs"), {"v": "docs"})
+    assert cache.get(b"s", cache.encode("fix the bug"))[1] == {"v": "bug"}
+    cache.put(b"s", cache.encode("delete everything"), {"v": "delete"})
+    assert cache.get(b"s", cache.encode("write docs")) is None
+    assert cache.get(b"s", cache.encode("fix the bug"))[1] == {"v": "bug"}
+    assert cache.get(b"s", cache.encode("delete everything"))[1] == {"v": "delete"}
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "sem_cache.npz"
+    cache = make_cache(path=path)
+    cache.put(b"s" * 16, cache.encode("fix the bug"), {"verdict": "proceed", "issues": []})
+    cache.put(b"t" * 16, cache.encode("write docs"), {"verdict": "heal"})
+    cache.save()
+    assert path.stat().st_mode & 0o777 == 0o600
+
+    loaded = make_cache(path=path)
+    loaded.load()
+    assert loaded.get(b"s" * 16, loaded.encode("please fix the bug"))[1] == {"verdict": "proceed", "issues": []}
+    assert loaded.get(b"t" * 16, loaded.encode("write docs"))[1] == {"verdict": "heal"}
+    assert loaded.get(b"s" * 16, loaded.encode("write docs")) is None
+
+
+def test_load_keeps_most_recent_when_maxlen_shrinks(tmp_path):
+    path = tmp_path / "sem_cache.npz"
+    cache = make_cache(path=path)
+    for prompt in ("fix the bug", "write docs", "delete everything"):
+        cache.put(b"s", cache.encode(prompt), {"p": prompt})
+    cache.save()
+
+    loaded = make_cache(path=path, maxlen=2)
+    loaded.load()
+    assert loaded.get(b"s", loaded.encode("fix the bug")) is None
+    assert loaded.get(b"s", loaded.encode("delete everything"))[1] == {"p": "delete everything"}
+
+
+def test_load_ignores_other_model(tmp_path):
+    path = tmp_path / "sem_cache.npz"
+    cache = make_cache(path=path)
+    cache.put(b"s", cache.encode("fix the bug"), {"verdict": "proceed"})
+    cache.save()
+
+    loaded = make_cache(path=path, model_name="other-model")
+    loaded.load()
+    assert loaded.get(b"s", loaded.encode("fix the bug")) is None
+
+
+@pytest.fixture
+def semantic(monkeypatch):
+    """Enable the semantic cache in tools with the stub encoder."""
+    config = Config(anthropic_api_key="test-key", response_cache=False, semantic_cache=True)
+    monkeypatch.setattr(tools, "load_config", lambda: config)
+    monkeypatch.setattr(tools, "_semantic_cache", make_cache())
+    monkeypatch.setattr(tools, "_semantic_cache_checked", True)
+    return config
+
+
+def test_tools_reuse_guard_verdicts_only(semantic):
+    guard = FakeProvider()
+    tools._complete_json("pp_guard", guard, "sys", "u1", prompt="fix the bug")
+    tools._complete_json("pp_guard", guard, "sys", "u2", prompt="please fix the bug")
+    assert guard.calls == 1
+
+    heal = FakeProvider(reply='{"healed_prompt": "fix the bug in foo.py"}')
+    tools._complete_json("pp_heal", heal, "sys", "u1", prompt="fix the bug")
+    tools._complete_json("pp_heal", heal, "sys", "u2", prompt="please fix the bug")
+    assert heal.calls == 2
+
+
+def test_threshold_follows_config(semantic):
+    reloaded = Config(anthropic_api_key="test-key", semantic_cache=True, semantic_cache_threshold=0.5)
+    assert tools._get_semantic_cache(reloaded).threshold == 0.5
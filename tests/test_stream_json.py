@@ -0,0 +1,77 @@
+"""Tests for reading the first JSON object out of a streamed LLM reply."""
+import json
+import random
+
+import pytest
+
+from mcp_server.tools import read_json_from_stream
+
+
+def _chunked(text, sizes):
+    """Split text into consecutive chunks of the given sizes (rest last)."""
+    chunks, pos = [], 0
+    for size in sizes:
+        chunks.append(text[pos:pos + size])
+        pos += size
+    chunks.append(text[pos:])
+    return [c for c in chunks if c]
+
+
+def _random_chunks(text, rng):
+    sizes = [rng.randint(1, 7) for _ in range(len(text))]
+    return _chunked(text, sizes)
+
+
+class _TrackedStream:
+    """Iterator over chunks that records how far it was read and closing."""
+
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.consumed >= len(self._chunks):
+            raise StopIteration
+        self.consumed += 1
+        return self._chunks[self.consumed - 1]
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("reply, expected", [
+    ('{"verdict": "proceed"}', {"verdict": "proceed"}),
+    ('```json\n{"verdict": "heal"}\n```', {"verdict": "heal"}),
+    ('Here you go:\n{"a": {"b": [1, {"c": 2}]}}\nHope that helps!', {"a": {"b": [1, {"c": 2}]}}),
+    ('{"reason": "use {braces} and } here {"}', {"reason": "use {braces} and } here {"}),
+    ('{"reason": "she said \\"{hi}\\" \\\\", "n": 1}', {"reason": 'she said "{hi}" \\', "n": 1}),
+    ('{"first": 1} {"second": 2}', {"first": 1}),
+])
+def test_parses_reply_regardless_of_chunking(reply, expected):
+    rng = random.Random(reply)
+    splits = [[reply], list(reply)] + [_random_chunks(reply, rng) for _ in range(50)]
+    for chunks in splits:
+        assert json.loads(read_json_from_stream(iter(chunks))) == expected
+
+
+def test_stops_reading_once_object_closes():
+    stream = _TrackedStream(['{"verdict": ', '"proceed"}', "\n```", " trailing", " text"])
+    assert read_json_from_stream(stream) == '{"verdict": "proceed"}'
+    assert stream.consumed == 2
+    assert stream.closed
+
+
+def test_truncated_stream_returns_partial_text():
+    stream = _TrackedStream(['```json\n{"verdict": ', '"proce'])
+    text = read_json_from_stream(stream)
+    assert stream.closed
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text)
+
+
+def test_reply_without_object_falls_back_to_fence_stripping():
+    assert read_json_from_stream(iter(["```json\n", "[1, 2]", "\n```"])) == "[1, 2]"